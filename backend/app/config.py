@@ -15,16 +15,23 @@ class Settings(BaseSettings):
     # Groq API (free, OpenAI-compatible)
     groq_api_key: str = ""
     groq_model: str = "llama-3.3-70b-versatile"
+    # Client-side limits so fan-out (batch scoring, gathered calls) stays
+    # under the account's rate limit instead of bursting into 429 retries.
+    # groq_requests_per_minute = 0 disables the rate limiter.
+    groq_max_concurrency: int = 10
+    groq_requests_per_minute: int = 30
 
     # Database
     database_url: str = "copilot.db"
 
     # Server
+    # Exact origins are matched by set membership; patterns go in the regex,
+    # which Starlette compiles once at startup (it has no glob support).
     cors_origins: list[str] = [
-        "chrome-extension://*",
         "http://localhost",
         "http://localhost:3000",
     ]
+    cors_origin_regex: str = r"^(chrome-extension://[a-p]{32}|http://localhost(:\d+)?)$"
 
     model_config = {
         "env_file": ".env",
@@ -6,16 +6,23 @@ Stores:
 - User profile (1 row) for personalization
 - Tracked jobs (n rows) for dashboard persistence
 - Job statistics and audit log
+- Parsed LLM responses, keyed by prompt hash
 
 See: STORAGE_SCHEMA_AND_MIGRATION.md for schema design and migration path.
 """
 
-import json
+import asyncio
+import base64
+import orjson
 import logging
+import os
+import time
 import aiosqlite
 import uuid
+from aiosqlitepool import SQLiteConnectionPool
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+from typing import Iterator, List, Dict, Optional
 
 from .config import get_settings
 from .models import UserProfile
@@ -69,11 +76,72 @@ CREATE TABLE IF NOT EXISTS tracked_jobs (
 
 CREATE_TRACKED_JOBS_INDEXES = [
     "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_status ON tracked_jobs(status);",
-    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_created ON tracked_jobs(created_at DESC);",
-    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_match ON tracked_jobs(match_percentage DESC);",
+    # The id tie-breaker lets keyset pages seek on (sort value, id) and read in
+    # ORDER BY order without a temp B-tree for the id part.
+    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_created_id ON tracked_jobs(created_at DESC, id DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_match_id ON tracked_jobs(match_percentage DESC, id DESC);",
     "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_ranking ON tracked_jobs(ranking_level);",
+    # Composite indexes for the list-jobs pattern: filter on status/ranking and
+    # read rows in sort order straight from the index instead of a temp B-tree.
+    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_status_created_id ON tracked_jobs(status, created_at DESC, id DESC);",
+    "CREATE INDEX IF NOT EXISTS idx_tracked_jobs_rank_match_id ON tracked_jobs(ranking_level, match_percentage DESC, id DESC);",
 ]
 
+# Superseded by the (..., sort column, id) indexes above
+DROP_OLD_TRACKED_JOBS_INDEXES = [
+    "DROP INDEX IF EXISTS idx_tracked_jobs_created;",
+    "DROP INDEX IF EXISTS idx_tracked_jobs_match;",
+    "DROP INDEX IF EXISTS idx_tracked_jobs_status_created;",
+    "DROP INDEX IF EXISTS idx_tracked_jobs_rank_match;",
+]
+
+# ─── Full-Text Search ─────────────────────────────────────────────────────
+
+# External-content FTS5 index over tracked_jobs; the triggers keep it in sync.
+# The update trigger only fires for the indexed columns, so metadata updates
+# (status, notes, dates) don't touch the index.
+# It is keyed on the implicit rowid (the primary key is TEXT), which VACUUM
+# may renumber. init_db() checks the index against tracked_jobs and rebuilds
+# it if they have drifted apart; rebuild_search_index() does so on demand.
+CREATE_TRACKED_JOBS_FTS_TABLE = """
+CREATE VIRTUAL TABLE IF NOT EXISTS tracked_jobs_fts USING fts5(
+    job_title, company_name, description,
+    content='tracked_jobs', content_rowid='rowid'
+);
+"""
+
+CREATE_TRACKED_JOBS_FTS_TRIGGERS = [
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_jobs_ai AFTER INSERT ON tracked_jobs BEGIN
+        INSERT INTO tracked_jobs_fts(rowid, job_title, company_name, description)
+        VALUES (new.rowid, new.job_title, new.company_name, new.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_jobs_ad AFTER DELETE ON tracked_jobs BEGIN
+        INSERT INTO tracked_jobs_fts(tracked_jobs_fts, rowid, job_title, company_name, description)
+        VALUES ('delete', old.rowid, old.job_title, old.company_name, old.description);
+    END;
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tracked_jobs_au
+    AFTER UPDATE OF job_title, company_name, description ON tracked_jobs BEGIN
+        INSERT INTO tracked_jobs_fts(tracked_jobs_fts, rowid, job_title, company_name, description)
+        VALUES ('delete', old.rowid, old.job_title, old.company_name, old.description);
+        INSERT INTO tracked_jobs_fts(rowid, job_title, company_name, description)
+        VALUES (new.rowid, new.job_title, new.company_name, new.description);
+    END;
+    """,
+]
+
+# Backfills the index from tracked_jobs (used when the FTS table is first created)
+REBUILD_TRACKED_JOBS_FTS = "INSERT INTO tracked_jobs_fts(tracked_jobs_fts) VALUES ('rebuild');"
+
+# Fails with a DatabaseError if the index no longer matches tracked_jobs
+CHECK_TRACKED_JOBS_FTS = (
+    "INSERT INTO tracked_jobs_fts(tracked_jobs_fts, rank) VALUES ('integrity-check', 1);"
+)
+
 # ─── Job Audit Log ────────────────────────────────────────────────────────
 
 CREATE_JOB_AUDIT_TABLE = """
@@ -88,19 +156,57 @@ CREATE TABLE IF NOT EXISTS job_audit_log (
 );
 """
 
-# SQL DML Statements
-INSERT_PROFILE = """
-INSERT INTO user_profile (name, skills, experience, summary)
-VALUES (?, ?, ?, ?);
+# ─── LLM Response Cache ────────────────────────────────────────────────────
+
+# Second tier of the LLM response cache in services.py (see the TTL notes
+# there): survives restarts and is shared by every worker on the host.
+# created_at is a Unix timestamp.
+CREATE_LLM_CACHE_TABLE = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response BLOB NOT NULL,
+    created_at REAL NOT NULL
+);
+"""
+
+CREATE_LLM_CACHE_INDEX = "CREATE INDEX IF NOT EXISTS idx_llm_cache_created ON llm_cache(created_at);"
+
+# Stored responses are served for this long; older rows are pruned on write
+# and at startup
+LLM_CACHE_MAX_AGE = 24 * 60 * 60  # seconds
+# Newest rows kept on write; profile enhancements run to several KB each
+LLM_CACHE_MAX_ROWS = 2000
+
+SELECT_LLM_CACHE = "SELECT response, created_at FROM llm_cache WHERE key = ? AND created_at >= ?;"
+
+UPSERT_LLM_CACHE = """
+INSERT INTO llm_cache (key, response, created_at) VALUES (?, ?, ?)
+ON CONFLICT(key) DO UPDATE SET response = excluded.response, created_at = excluded.created_at;
+"""
+
+DELETE_EXPIRED_LLM_CACHE = "DELETE FROM llm_cache WHERE created_at < ?;"
+
+# Drops expired rows and everything past the newest LLM_CACHE_MAX_ROWS
+PRUNE_LLM_CACHE = """
+DELETE FROM llm_cache
+WHERE created_at < ?
+   OR key IN (SELECT key FROM llm_cache ORDER BY created_at DESC LIMIT -1 OFFSET ?);
 """
 
-UPDATE_PROFILE = """
-UPDATE user_profile
-SET name = ?, skills = ?, experience = ?, summary = ?
-WHERE id = ?;
+# SQL DML Statements
+# The single profile always lives at id 1, so create-or-update is one statement
+UPSERT_PROFILE = """
+INSERT INTO user_profile (id, name, skills, experience, summary)
+VALUES (1, ?, ?, ?, ?)
+ON CONFLICT(id) DO UPDATE SET
+    name = excluded.name,
+    skills = excluded.skills,
+    experience = excluded.experience,
+    summary = excluded.summary
+RETURNING id;
 """
 
-SELECT_PROFILE = "SELECT id, name, skills, experience, summary FROM user_profile LIMIT 1;"
+SELECT_PROFILE = "SELECT id, name, skills, experience, summary FROM user_profile ORDER BY id LIMIT 1;"
 
 INSERT_TRACKED_JOB = """
 INSERT INTO tracked_jobs (
@@ -128,10 +234,26 @@ SELECT id, job_title, company_name, location, description, job_url,
 FROM tracked_jobs
 WHERE 1=1
 {filters}
-ORDER BY {sort_by} {sort_order}
+ORDER BY {sort_by} {sort_order}, id {sort_order}
 LIMIT ? OFFSET ?;
 """
 
+# Keyset page: continues after the (sort value, id) of the previous page's last
+# row, so deep pages cost O(pageSize) instead of skipping OFFSET rows. No
+# total here, since counting would scan the whole filtered set again.
+SELECT_TRACKED_JOBS_AFTER_CURSOR = """
+SELECT id, job_title, company_name, location, description, job_url, 
+       source_linkedin_id, match_percentage, ranking_level, matched_skills, 
+       missing_skills, status, notes, created_at, updated_at, last_viewed_at,
+       application_date, rejection_date, rejection_reason, interview_date,
+       interview_stage, salary_min, salary_max, source
+FROM tracked_jobs
+WHERE ({sort_by}, id) {comparator} (?, ?)
+{filters}
+ORDER BY {sort_by} {sort_order}, id {sort_order}
+LIMIT ?;
+"""
+
 SELECT_TRACKED_JOBS_COUNT = """
 SELECT COUNT(*) FROM tracked_jobs WHERE 1=1 {filters};
 """
@@ -139,41 +261,178 @@ SELECT COUNT(*) FROM tracked_jobs WHERE 1=1 {filters};
 UPDATE_TRACKED_JOB = """
 UPDATE tracked_jobs
 SET {updates}, updated_at = ?
-WHERE id = ?;
+WHERE id = ?
+RETURNING id, job_title, company_name, location, description, job_url, 
+          source_linkedin_id, match_percentage, ranking_level, matched_skills, 
+          missing_skills, status, notes, created_at, updated_at, last_viewed_at,
+          application_date, rejection_date, rejection_reason, interview_date,
+          interview_stage, salary_min, salary_max, source;
 """
 
 DELETE_TRACKED_JOB = """
 DELETE FROM tracked_jobs WHERE id = ?;
 """
 
+# One scan grouped by (status, ranking_level); totals, averages, per-status,
+# per-ranking and funnel counts are all derived from these groups.
+SELECT_JOB_STATS = """
+SELECT status, ranking_level, COUNT(*), SUM(match_percentage), COUNT(match_percentage)
+FROM tracked_jobs
+GROUP BY status, ranking_level;
+"""
+
+# Skill-gap aggregation done inside SQLite with JSON1, without decoding every
+# missing_skills array in Python
+SELECT_TOP_MISSING_SKILLS = """
+SELECT value, COUNT(*)
+FROM tracked_jobs, json_each(tracked_jobs.missing_skills)
+GROUP BY value
+ORDER BY COUNT(*) DESC, value
+LIMIT ?;
+"""
+
+TOP_MISSING_SKILLS_LIMIT = 10
+
+
+# ─── Connection Tuning ─────────────────────────────────────────────────────
+
+# journal_mode=WAL is persisted in the database file header, so running it once
+# in init_db() is enough for every later connection. WAL lets readers proceed
+# while a writer commits.
+JOURNAL_PRAGMA = "PRAGMA journal_mode=WAL;"
+
+# The remaining pragmas are per-connection and are applied to every pooled
+# connection. synchronous=NORMAL drops the per-commit fsync of the rollback
+# journal (still durable across application crashes).
+CONNECTION_PRAGMAS = [
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA cache_size=-20000;",
+]
+
+POOL_SIZE = 5
+
+# Per-connection LRU of compiled statements in the sqlite3 driver. Repeated SQL
+# text skips SQLite's parse/plan step, so hot queries should use stable strings.
+STATEMENT_CACHE_SIZE = 256
+
+# Pages larger than this decode their JSON columns in a worker thread
+ROW_DECODE_THREAD_THRESHOLD = 50
+
+_pool: SQLiteConnectionPool | None = None
+
+# Resolved once by init_db() so connection setup doesn't go through settings
+_DB_PATH: str | None = None
+
 
 def _get_db_path() -> str:
     """Return the SQLite database file path."""
-    return get_settings().database_url
+    return _DB_PATH or get_settings().database_url
+
+
+async def _apply_pragmas(db: aiosqlite.Connection) -> None:
+    """Apply per-connection tuning pragmas (skipped for in-memory databases)."""
+    if _get_db_path() == ":memory:":
+        return
+    for pragma_sql in CONNECTION_PRAGMAS:
+        await db.execute(pragma_sql)
+
+
+async def _create_connection() -> aiosqlite.Connection:
+    """Open a new connection for the pool."""
+    db = await aiosqlite.connect(_get_db_path(), cached_statements=STATEMENT_CACHE_SIZE)
+    db.row_factory = aiosqlite.Row
+    await _apply_pragmas(db)
+    return db
+
+
+def _get_pool() -> SQLiteConnectionPool:
+    """
+    Return the shared connection pool, creating it on first use.
+
+    Long-lived connections keep SQLite's page cache warm across requests
+    instead of paying connection setup/teardown on every query.
+    """
+    global _pool
+    if _pool is None:
+        _pool = SQLiteConnectionPool(_create_connection, pool_size=POOL_SIZE)
+    return _pool
+
+
+async def close_db() -> None:
+    """Close all pooled connections (called on application shutdown)."""
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
 
 
 async def init_db() -> None:
     """Create all tables if they don't exist."""
+    global _DB_PATH
+    _DB_PATH = get_settings().database_url
+    
     async with aiosqlite.connect(_get_db_path()) as db:
+        if _get_db_path() != ":memory:":
+            await db.execute(JOURNAL_PRAGMA)
+            await _apply_pragmas(db)
+
         await db.execute(CREATE_USER_PROFILE_TABLE)
         await db.execute(CREATE_TRACKED_JOBS_TABLE)
         await db.execute(CREATE_JOB_AUDIT_TABLE)
+        await db.execute(CREATE_LLM_CACHE_TABLE)
+        await db.execute(CREATE_LLM_CACHE_INDEX)
+        await db.execute(DELETE_EXPIRED_LLM_CACHE, (time.time() - LLM_CACHE_MAX_AGE,))
+        
+        # Full-text search index (backfilled from existing rows on first creation)
+        cursor = await db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'tracked_jobs_fts'"
+        )
+        fts_exists = await cursor.fetchone() is not None
+        await db.execute(CREATE_TRACKED_JOBS_FTS_TABLE)
+        for trigger_sql in CREATE_TRACKED_JOBS_FTS_TRIGGERS:
+            await db.execute(trigger_sql)
+        if not fts_exists:
+            await db.execute(REBUILD_TRACKED_JOBS_FTS)
+        else:
+            try:
+                await db.execute(CHECK_TRACKED_JOBS_FTS)
+            except aiosqlite.DatabaseError:
+                logger.warning("Full-text index out of sync with tracked_jobs; rebuilding")
+                await db.execute(REBUILD_TRACKED_JOBS_FTS)
         
         # Create indexes
-        for index_sql in CREATE_TRACKED_JOBS_INDEXES:
+        for index_sql in DROP_OLD_TRACKED_JOBS_INDEXES + CREATE_TRACKED_JOBS_INDEXES:
             await db.execute(index_sql)
         
+        # Refresh planner statistics so the composite indexes get picked
+        await db.execute("ANALYZE;")
+        
         await db.commit()
     logger.info("Database initialized at %s", _get_db_path())
 
 
+async def rebuild_search_index() -> None:
+    """
+    Rebuild the full-text index from tracked_jobs.
+
+    Run after anything that may renumber tracked_jobs rowids (e.g. VACUUM),
+    which would otherwise make searches return the wrong jobs.
+    """
+    async with _get_pool().connection() as db:
+        await db.execute(REBUILD_TRACKED_JOBS_FTS)
+        await db.commit()
+    logger.info("Full-text search index rebuilt")
+
+
 async def get_user_profile() -> UserProfile | None:
     """
     Retrieve the stored user profile.
 
     Returns None if no profile exists yet.
     """
-    async with aiosqlite.connect(_get_db_path()) as db:
+    async with _get_pool().connection() as db:
         cursor = await db.execute(SELECT_PROFILE)
         row = await cursor.fetchone()
 
@@ -183,7 +442,7 @@ async def get_user_profile() -> UserProfile | None:
     return UserProfile(
         id=row[0],
         name=row[1],
-        skills=json.loads(row[2]),
+        skills=orjson.loads(row[2]),
         experience=row[3],
         summary=row[4],
     )
@@ -194,23 +453,17 @@ async def save_user_profile(profile: UserProfile) -> UserProfile:
     Create or update the user profile.
 
     If a profile already exists, it is updated. Otherwise a new row is inserted.
+    Both cases are a single atomic UPSERT on the fixed profile row.
     """
-    existing = await get_user_profile()
-    skills_json = json.dumps(profile.skills)
+    skills_json = orjson.dumps(profile.skills).decode()
 
-    async with aiosqlite.connect(_get_db_path()) as db:
-        if existing:
-            await db.execute(
-                UPDATE_PROFILE,
-                (profile.name, skills_json, profile.experience, profile.summary, existing.id),
-            )
-            profile.id = existing.id
-        else:
-            cursor = await db.execute(
-                INSERT_PROFILE,
-                (profile.name, skills_json, profile.experience, profile.summary),
-            )
-            profile.id = cursor.lastrowid
+    async with _get_pool().connection() as db:
+        cursor = await db.execute(
+            UPSERT_PROFILE,
+            (profile.name, skills_json, profile.experience, profile.summary),
+        )
+        row = await cursor.fetchone()
+        profile.id = row[0]
         await db.commit()
 
     logger.info("User profile saved (id=%s)", profile.id)
@@ -220,44 +473,37 @@ async def save_user_profile(profile: UserProfile) -> UserProfile:
 # ─── Job Tracking Functions (Dashboard v2.0) ───────────────────────────────────
 
 
-def _row_to_job_dict(row: tuple) -> Dict:
-    """Convert database row to job dictionary."""
-    return {
-        "id": row[0],
-        "job_title": row[1],
-        "company_name": row[2],
-        "location": row[3],
-        "description": row[4],
-        "job_url": row[5],
-        "source_linkedin_id": row[6],
-        "match_percentage": row[7],
-        "ranking_level": row[8],
-        "matched_skills": json.loads(row[9]) if row[9] else [],
-        "missing_skills": json.loads(row[10]) if row[10] else [],
-        "status": row[11],
-        "notes": row[12],
-        "created_at": row[13],
-        "updated_at": row[14],
-        "last_viewed_at": row[15],
-        "application_date": row[16],
-        "rejection_date": row[17],
-        "rejection_reason": row[18],
-        "interview_date": row[19],
-        "interview_stage": row[20],
-        "salary_min": row[21],
-        "salary_max": row[22],
-        "source": row[23],
-    }
+def _row_to_job_dict(row: aiosqlite.Row) -> Dict:
+    """
+    Convert database row to job dictionary.
 
+    SELECT column names match the job dict keys, so the Row converts in one
+    C-level dict() call; only the JSON skill columns need decoding.
+    """
+    job = dict(row)
+    job["matched_skills"] = orjson.loads(job["matched_skills"]) if job["matched_skills"] else []
+    job["missing_skills"] = orjson.loads(job["missing_skills"]) if job["missing_skills"] else []
+    return job
 
-async def save_tracked_job(job_data: Dict) -> Dict:
+
+def _new_job_ids(count: int) -> List[str]:
+    """Generate `count` UUID4 strings from a single os.urandom() call."""
+    entropy = os.urandom(16 * count)
+    return [
+        str(uuid.UUID(bytes=entropy[i:i + 16], version=4))
+        for i in range(0, len(entropy), 16)
+    ]
+
+
+def _prepare_tracked_job(job_data: Dict, now: str, new_ids: Iterator[str]) -> tuple:
     """
-    Save a tracked job to the database.
+    Validate a job dict and build its INSERT_TRACKED_JOB parameter tuple.
 
-    Validates required fields and generates ID if missing.
+    Fills in the generated ID, timestamps and decoded skill lists on
+    job_data so it can be returned to the caller as the saved job.
     """
     # Generate ID if missing - use UUID for guaranteed uniqueness
-    job_id = job_data.get("id") or str(uuid.uuid4())
+    job_id = job_data.get("id") or next(new_ids)
     
     # Prepare fields
     job_title = job_data.get("job_title", "")
@@ -266,48 +512,70 @@ async def save_tracked_job(job_data: Dict) -> Dict:
     if not job_title or not company_name:
         raise ValueError("job_title and company_name are required")
     
-    matched_skills_json = json.dumps(job_data.get("matched_skills", []))
-    missing_skills_json = json.dumps(job_data.get("missing_skills", []))
-    now = datetime.utcnow().isoformat()
+    matched_skills_json = orjson.dumps(job_data.get("matched_skills", [])).decode()
+    missing_skills_json = orjson.dumps(job_data.get("missing_skills", [])).decode()
     
-    async with aiosqlite.connect(_get_db_path()) as db:
-        await db.execute(
-            INSERT_TRACKED_JOB,
-            (
-                job_id,
-                job_title,
-                company_name,
-                job_data.get("location", ""),
-                job_data.get("description", ""),
-                job_data.get("job_url", ""),
-                job_data.get("source_linkedin_id", ""),
-                job_data.get("match_percentage", 0),
-                job_data.get("ranking_level", "low"),
-                matched_skills_json,
-                missing_skills_json,
-                job_data.get("status", "new"),
-                job_data.get("notes", ""),
-                job_data.get("source", "manual"),
-                now,
-                now,
-            ),
-        )
-        await db.commit()
+    params = (
+        job_id,
+        job_title,
+        company_name,
+        job_data.get("location", ""),
+        job_data.get("description", ""),
+        job_data.get("job_url", ""),
+        job_data.get("source_linkedin_id", ""),
+        job_data.get("match_percentage", 0),
+        job_data.get("ranking_level", "low"),
+        matched_skills_json,
+        missing_skills_json,
+        job_data.get("status", "new"),
+        job_data.get("notes", ""),
+        job_data.get("source", "manual"),
+        now,
+        now,
+    )
     
-    # Return the saved job
     job_data["id"] = job_id
     job_data["created_at"] = now
     job_data["updated_at"] = now
-    job_data["matched_skills"] = json.loads(matched_skills_json)
-    job_data["missing_skills"] = json.loads(missing_skills_json)
+    job_data["matched_skills"] = orjson.loads(matched_skills_json)
+    job_data["missing_skills"] = orjson.loads(missing_skills_json)
+    return params
+
+
+async def save_tracked_jobs_bulk(jobs: List[Dict]) -> List[Dict]:
+    """
+    Save several tracked jobs in a single transaction.
+
+    All jobs are validated before anything is written, then inserted with
+    one executemany() and one commit, so a batch of K jobs pays for a
+    single fsync instead of K. The timestamp and any missing IDs are also
+    generated once for the whole batch.
+    """
+    now = datetime.utcnow().isoformat()
+    new_ids = iter(_new_job_ids(sum(1 for job_data in jobs if not job_data.get("id"))))
+    rows = [_prepare_tracked_job(job_data, now, new_ids) for job_data in jobs]
+    
+    async with _get_pool().connection() as db:
+        await db.executemany(INSERT_TRACKED_JOB, rows)
+        await db.commit()
     
-    logger.info(f"Saved tracked job: {job_title} at {company_name}")
-    return job_data
+    return jobs
+
+
+async def save_tracked_job(job_data: Dict) -> Dict:
+    """
+    Save a tracked job to the database.
+
+    Validates required fields and generates ID if missing.
+    """
+    saved = (await save_tracked_jobs_bulk([job_data]))[0]
+    logger.info("Saved tracked job: %s at %s", saved["job_title"], saved["company_name"])
+    return saved
 
 
 async def get_tracked_job(job_id: str) -> Optional[Dict]:
     """Retrieve a single tracked job by ID."""
-    async with aiosqlite.connect(_get_db_path()) as db:
+    async with _get_pool().connection() as db:
         cursor = await db.execute(SELECT_TRACKED_JOB, (job_id,))
         row = await cursor.fetchone()
     
@@ -317,6 +585,101 @@ async def get_tracked_job(job_id: str) -> Optional[Dict]:
     return _row_to_job_dict(row)
 
 
+def _build_fts_query(search: str) -> str:
+    """
+    Turn free-form user input into a safe FTS5 MATCH expression.
+
+    Each whitespace-separated word becomes a quoted prefix term, so
+    "pyth eng" matches "Python Engineer" and FTS5 operators or stray
+    quotes in the input are treated as plain text.
+    """
+    terms = []
+    for word in search.split():
+        escaped = word.replace('"', '""')
+        terms.append(f'"{escaped}"*')
+    return " ".join(terms)
+
+
+def _encode_cursor(job: Dict, sort_by: str, sort_order: str) -> str:
+    """Encode the keyset position after `job` under one sort as an opaque URL-safe cursor."""
+    return base64.urlsafe_b64encode(
+        orjson.dumps([sort_by, sort_order, job[sort_by], job["id"]])
+    ).decode()
+
+
+def _decode_cursor(cursor: str, sort_by: str, sort_order: str) -> tuple:
+    """
+    Decode a cursor from _encode_cursor.
+
+    Raises ValueError if it is malformed or was issued for a different sort,
+    since its position would then be compared against the wrong column.
+    """
+    try:
+        cursor_sort_by, cursor_sort_order, sort_value, job_id = orjson.loads(
+            base64.urlsafe_b64decode(cursor.encode())
+        )
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid pagination cursor") from e
+    if (cursor_sort_by, cursor_sort_order) != (sort_by, sort_order):
+        raise ValueError(
+            f"Pagination cursor was issued for sortBy={cursor_sort_by}, sortOrder={cursor_sort_order}"
+        )
+    return sort_value, job_id
+
+
+async def _rows_to_job_dicts(rows: List) -> List[Dict]:
+    """Convert rows to job dicts, off the event loop for large pages."""
+    if len(rows) > ROW_DECODE_THREAD_THRESHOLD:
+        return await asyncio.to_thread(lambda: [_row_to_job_dict(row) for row in rows])
+    return [_row_to_job_dict(row) for row in rows]
+
+
+@lru_cache(maxsize=256)
+def _build_list_sql(
+    kind: str,
+    sort_by: str,
+    sort_order: str,
+    has_status: bool,
+    has_min_match: bool,
+    has_ranking: bool,
+    has_search: bool,
+) -> str:
+    """
+    Build the listing SQL for one query shape.
+
+    kind is "page", "cursor" or "count". The status filter binds a single
+    JSON array, so every call with the same shape gets the exact same SQL
+    text and sqlite3's statement cache can reuse the prepared statement.
+    """
+    where_parts = []
+    if has_status:
+        where_parts.append("status IN (SELECT value FROM json_each(?))")
+    if has_min_match:
+        where_parts.append("match_percentage >= ?")
+    if has_ranking:
+        where_parts.append("ranking_level = ?")
+    if has_search:
+        where_parts.append(
+            "rowid IN (SELECT rowid FROM tracked_jobs_fts WHERE tracked_jobs_fts MATCH ?)"
+        )
+    filter_sql = "AND " + " AND ".join(where_parts) if where_parts else ""
+    
+    if kind == "count":
+        return SELECT_TRACKED_JOBS_COUNT.format(filters=filter_sql)
+    if kind == "cursor":
+        return SELECT_TRACKED_JOBS_AFTER_CURSOR.format(
+            filters=filter_sql,
+            sort_by=sort_by,
+            sort_order=sort_order.upper(),
+            comparator="<" if sort_order == "desc" else ">",
+        )
+    return SELECT_ALL_TRACKED_JOBS.format(
+        filters=filter_sql,
+        sort_by=sort_by,
+        sort_order=sort_order.upper(),
+    )
+
+
 async def list_tracked_jobs(
     page: int = 1,
     pageSize: int = 10,
@@ -324,6 +687,7 @@ async def list_tracked_jobs(
     search: Optional[str] = None,
     sortBy: str = "created_at",
     sortOrder: str = "desc",
+    cursor: Optional[str] = None,
 ) -> Dict:
     """
     List tracked jobs with filtering, searching, sorting, and pagination.
@@ -332,74 +696,87 @@ async def list_tracked_jobs(
     - status: List of statuses (e.g. ["new", "applied"])
     - min_match_percentage: Minimum match % (e.g. 70)
     - ranking_level: Filter by ranking (e.g. "high")
+
+    Pagination: pass the returned next_cursor back as `cursor` to fetch the
+    following page by keyset (page is then ignored and total is None);
+    otherwise page/pageSize use LIMIT/OFFSET. A cursor replayed with a
+    different sortBy/sortOrder raises ValueError.
     """
     filters = filters or {}
     offset = (page - 1) * pageSize
     
-    # Build WHERE clauses
-    where_parts = []
+    # Collect bind parameters; the SQL text only depends on which filters are set
     params = []
     
-    if filters.get("status"):
-        status_placeholders = ",".join(["?"] * len(filters["status"]))
-        where_parts.append(f"status IN ({status_placeholders})")
-        params.extend(filters["status"])
+    has_status = bool(filters.get("status"))
+    if has_status:
+        params.append(orjson.dumps(list(filters["status"])).decode())
     
-    if filters.get("min_match_percentage") is not None:
-        where_parts.append(f"match_percentage >= ?")
+    has_min_match = filters.get("min_match_percentage") is not None
+    if has_min_match:
         params.append(filters["min_match_percentage"])
     
-    if filters.get("ranking_level"):
-        where_parts.append(f"ranking_level = ?")
+    has_ranking = bool(filters.get("ranking_level"))
+    if has_ranking:
         params.append(filters["ranking_level"])
     
-    if search:
-        where_parts.append(f"(job_title LIKE ? OR company_name LIKE ? OR description LIKE ?)")
-        search_term = f"%{search}%"
-        params.extend([search_term, search_term, search_term])
+    search_query = _build_fts_query(search) if search else ""
+    if search_query:
+        params.append(search_query)
     
-    filter_sql = "AND " + " AND ".join(where_parts) if where_parts else ""
+    filter_key = (has_status, has_min_match, has_ranking, bool(search_query))
     
     # Validate sort parameters
     valid_sort_fields = ["created_at", "match_percentage", "job_title", "company_name", "updated_at"]
     sortBy = sortBy if sortBy in valid_sort_fields else "created_at"
-    sortOrder = sortOrder if sortOrder.lower() in ["asc", "desc"] else "desc"
+    sortOrder = sortOrder.lower() if sortOrder.lower() in ["asc", "desc"] else "desc"
     
-    # Get total count
-    count_sql = SELECT_TRACKED_JOBS_COUNT.format(filters=filter_sql)
-    async with aiosqlite.connect(_get_db_path()) as db:
-        cursor = await db.execute(count_sql, params)
-        count_row = await cursor.fetchone()
-        total = count_row[0] if count_row else 0
-    
-    # Get paginated results
-    query_sql = SELECT_ALL_TRACKED_JOBS.format(
-        filters=filter_sql,
-        sort_by=sortBy,
-        sort_order=sortOrder.upper(),
-    )
-    
-    query_params = params + [pageSize, offset]
-    
-    async with aiosqlite.connect(_get_db_path()) as db:
-        cursor = await db.execute(query_sql, query_params)
-        rows = await cursor.fetchall()
-    
-    jobs = [_row_to_job_dict(row) for row in rows]
+    if cursor:
+        # Keyset page; fetch one extra row to know whether another page exists
+        sort_value, last_id = _decode_cursor(cursor, sortBy, sortOrder)
+        query_sql = _build_list_sql("cursor", sortBy, sortOrder, *filter_key)
+        query_params = [sort_value, last_id] + params + [pageSize + 1]
+        
+        async with _get_pool().connection() as db:
+            db_cursor = await db.execute(query_sql, query_params)
+            rows = await db_cursor.fetchall()
+        
+        has_more = len(rows) > pageSize
+        jobs = await _rows_to_job_dicts(rows[:pageSize])
+        total = None
+    else:
+        # Count separately: a COUNT(*) OVER () window would read and sort every
+        # filtered row on each page, while these two queries stay on the indexes.
+        count_sql = _build_list_sql("count", sortBy, sortOrder, *filter_key)
+        query_sql = _build_list_sql("page", sortBy, sortOrder, *filter_key)
+        
+        async with _get_pool().connection() as db:
+            db_cursor = await db.execute(count_sql, params)
+            count_row = await db_cursor.fetchone()
+            total = count_row[0] if count_row else 0
+            
+            db_cursor = await db.execute(query_sql, params + [pageSize, offset])
+            rows = await db_cursor.fetchall()
+        
+        has_more = offset + len(rows) < total
+        jobs = await _rows_to_job_dicts(rows)
     
     return {
         "jobs": jobs,
         "total": total,
+        "next_cursor": _encode_cursor(jobs[-1], sortBy, sortOrder) if jobs and has_more else None,
     }
 
 
+@lru_cache(maxsize=128)
+def _build_update_sql(fields: tuple) -> str:
+    """Build the UPDATE statement for a sorted tuple of column names."""
+    set_sql = ", ".join(f"{k} = ?" for k in fields)
+    return UPDATE_TRACKED_JOB.format(updates=set_sql)
+
+
 async def update_tracked_job(job_id: str, updates: Dict) -> Optional[Dict]:
     """Update a tracked job. Can only update metadata, not scores."""
-    # Retrieve existing job first
-    existing = await get_tracked_job(job_id)
-    if not existing:
-        return None
-    
     # Only allow certain fields to be updated
     allowed_fields = {
         "status", "notes", "application_date", "rejection_date",
@@ -411,33 +788,34 @@ async def update_tracked_job(job_id: str, updates: Dict) -> Optional[Dict]:
     safe_updates = {k: v for k, v in updates.items() if k in allowed_fields}
     
     if not safe_updates:
-        return existing
+        return await get_tracked_job(job_id)
     
-    # Build SET clause
-    set_parts = [f"{k} = ?" for k in safe_updates.keys()]
-    set_sql = ", ".join(set_parts)
+    # Sort the fields so each field set maps to one reusable SQL string
+    fields = tuple(sorted(safe_updates))
+    update_sql = _build_update_sql(fields)
     
     # Prepare parameters
-    params = list(safe_updates.values())
+    params = [safe_updates[k] for k in fields]
     now = datetime.utcnow().isoformat()
     params.append(now)
     params.append(job_id)
     
-    update_sql = UPDATE_TRACKED_JOB.format(updates=set_sql)
-    
-    async with aiosqlite.connect(_get_db_path()) as db:
-        await db.execute(update_sql, params)
+    # RETURNING hands back the updated row (or nothing if the ID is unknown)
+    async with _get_pool().connection() as db:
+        cursor = await db.execute(update_sql, params)
+        row = await cursor.fetchone()
         await db.commit()
     
-    logger.info(f"Updated tracked job {job_id}: {safe_updates}")
+    if not row:
+        return None
     
-    # Return updated job
-    return await get_tracked_job(job_id)
+    logger.info("Updated tracked job %s: %s", job_id, safe_updates)
+    return _row_to_job_dict(row)
 
 
 async def delete_tracked_job(job_id: str) -> bool:
     """Delete a tracked job. Returns True if deleted, False if not found."""
-    async with aiosqlite.connect(_get_db_path()) as db:
+    async with _get_pool().connection() as db:
         cursor = await db.execute(DELETE_TRACKED_JOB, (job_id,))
         await db.commit()
         return cursor.rowcount > 0
@@ -452,53 +830,64 @@ async def get_job_stats() -> Dict:
     - Average match %
     - Breakdown by status and ranking
     - Conversion funnel (new → applied → interviewed → rejected)
+    - Most common missing skills across tracked jobs
     """
-    async with aiosqlite.connect(_get_db_path()) as db:
-        # Total count
-        cursor = await db.execute("SELECT COUNT(*) FROM tracked_jobs")
-        total = (await cursor.fetchone())[0]
-        
-        # Average match %
-        cursor = await db.execute("SELECT AVG(match_percentage) FROM tracked_jobs")
-        avg_match = (await cursor.fetchone())[0] or 0
-        
-        # Count by status
-        cursor = await db.execute(
-            "SELECT status, COUNT(*) FROM tracked_jobs GROUP BY status"
-        )
-        status_counts = dict(await cursor.fetchall())
-        
-        # Count by ranking
-        cursor = await db.execute(
-            "SELECT ranking_level, COUNT(*) FROM tracked_jobs GROUP BY ranking_level"
-        )
-        ranking_counts = dict(await cursor.fetchall())
+    async with _get_pool().connection() as db:
+        cursor = await db.execute(SELECT_JOB_STATS)
+        rows = await cursor.fetchall()
         
-        # Conversion funnel
-        cursor = await db.execute(
-            """
-            SELECT 
-                COALESCE(status, 'unknown') as status, 
-                COUNT(*) as count
-            FROM tracked_jobs
-            WHERE status IN ('new', 'applied', 'interested', 'interviewed', 'rejected')
-            GROUP BY status
-            ORDER BY status
-            """
-        )
-        funnel_rows = await cursor.fetchall()
-        funnel = {row[0]: row[1] for row in funnel_rows}
-    
+        cursor = await db.execute(SELECT_TOP_MISSING_SKILLS, (TOP_MISSING_SKILLS_LIMIT,))
+        top_missing_skills = [
+            {"skill": skill, "count": count} for skill, count in await cursor.fetchall()
+        ]
+
+    # Fold the (status, ranking_level) groups into every breakdown in Python
+    total = 0
+    match_sum = 0
+    match_count = 0
+    status_counts: Dict = {}
+    ranking_counts: Dict = {}
+    for status, ranking_level, count, group_match_sum, group_match_count in rows:
+        total += count
+        match_sum += group_match_sum or 0
+        match_count += group_match_count
+        status_counts[status] = status_counts.get(status, 0) + count
+        ranking_counts[ranking_level] = ranking_counts.get(ranking_level, 0) + count
+    avg_match = match_sum / match_count if match_count else 0
+
     return {
         "total_jobs": total,
         "average_match_percentage": round(float(avg_match), 1),
         "by_status": status_counts,
         "by_ranking": ranking_counts,
         "funnel": {
-            "new": funnel.get("new", 0),
-            "applied": funnel.get("applied", 0),
-            "interested": funnel.get("interested", 0),
-            "interviewed": funnel.get("interviewed", 0),
-            "rejected": funnel.get("rejected", 0),
+            "new": status_counts.get("new", 0),
+            "applied": status_counts.get("applied", 0),
+            "interested": status_counts.get("interested", 0),
+            "interviewed": status_counts.get("interviewed", 0),
+            "rejected": status_counts.get("rejected", 0),
         },
+        "top_missing_skills": top_missing_skills,
     }
+
+
+async def get_cached_llm_response(key: str, max_age: float) -> Optional[tuple]:
+    """
+    Return a stored LLM response no older than max_age seconds, or None.
+
+    The response comes back as (response, age in seconds).
+    """
+    now = time.time()
+    async with _get_pool().connection() as db:
+        cursor = await db.execute(SELECT_LLM_CACHE, (key, now - max_age))
+        row = await cursor.fetchone()
+    return (orjson.loads(row[0]), now - row[1]) if row else None
+
+
+async def save_cached_llm_response(key: str, response: Dict) -> None:
+    """Store (or refresh) a parsed LLM response under its prompt hash, pruning old rows."""
+    now = time.time()
+    async with _get_pool().connection() as db:
+        await db.execute(UPSERT_LLM_CACHE, (key, orjson.dumps(response), now))
+        await db.execute(PRUNE_LLM_CACHE, (now - LLM_CACHE_MAX_AGE, LLM_CACHE_MAX_ROWS))
+        await db.commit()
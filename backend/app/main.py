@@ -6,21 +6,30 @@ and provides a health check endpoint.
 """
 
 import logging
+import logging.handlers
+import queue
 import re
+import orjson
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Response
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from .config import get_settings
-from .database import init_db, get_user_profile, save_user_profile
+from .dependencies import json_body, json_body_openapi
+from .database import init_db, close_db, get_user_profile, save_user_profile
 from .models import (
     UserProfile, UserProfileUpdate,
     ProfileEnhancementRequest, ProfileEnhancementResponse,
     ProfileAnalysisRequest, ProfileEnhanceRequest,
 )
 from .routers import comments, jobs, batch_scoring
-from .services import analyze_profile_text, enhance_profile_text, enhance_profile as enhance_profile_service
+from .services import (
+    analyze_profile_text, enhance_profile_text, enhance_profile as enhance_profile_service,
+    analyze_and_enhance_profile_text,
+    stream_profile_enhancement, close_client,
+)
 
 
 # ─── Logging Security ──────────────────────────────────────────────────────
@@ -44,10 +53,34 @@ def sanitize_log_input(value: str, max_len: int = 100) -> str:
 
 # ─── Logging ─────────────────────────────────────────────────────────────────
 
+# Request handlers only enqueue records; the listener thread started in
+# lifespan does the formatting and the blocking stderr write.
+
+
+class _InProcessQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that enqueues records unformatted."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() merges msg % args and renders exc_info on the
+        # caller's thread so records can be pickled; this queue never leaves
+        # the process, so leave all of that to the listener's formatter.
+        return record
+
+
+_log_queue: queue.Queue = queue.Queue(-1)
+_stream_handler = logging.StreamHandler()
+_stream_handler.setFormatter(logging.Formatter(
+    "%(asctime)s │ %(levelname)-8s │ %(name)s │ %(message)s",
+    datefmt="%H:%M:%S",
+))
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, _stream_handler, respect_handler_level=True
+)
+
 logging.basicConfig(
     level=logging.INFO,
-    format="%(asctime)s │ %(levelname)-8s │ %(name)s │ %(message)s",
-    datefmt="%H:%M:%S",
+    format="%(message)s",
+    handlers=[_InProcessQueueHandler(_log_queue)],
 )
 logger = logging.getLogger(__name__)
 
@@ -57,10 +90,17 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize resources on startup, cleanup on shutdown."""
+    _log_listener.start()
     logger.info("🚀 LinkedIn AI Copilot backend starting up…")
     await init_db()
+    # Model validators are built at import; the JSON schemas behind /docs are
+    # generated lazily, so build (and cache) them here instead of on first hit.
+    app.openapi()
     yield
+    await close_client()
+    await close_db()
     logger.info("👋 Backend shutting down.")
+    _log_listener.stop()
 
 
 # ─── App ─────────────────────────────────────────────────────────────────────
@@ -70,6 +110,7 @@ app = FastAPI(
     description="Personal AI-powered LinkedIn assistant – Comment, Job analysis, & Dashboard tracking.",
     version="2.0.0",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
 # CORS – allow requests from Chrome extension and local dev
@@ -77,6 +118,7 @@ settings = get_settings()
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.cors_origins,
+    allow_origin_regex=settings.cors_origin_regex,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -128,8 +170,20 @@ async def enhance_profile(data: ProfileEnhanceRequest):
     return await enhance_profile_text(data.raw_text)
 
 
-@app.post("/enhance-profile-advanced", response_model=ProfileEnhancementResponse)
-async def enhance_profile_advanced(request: ProfileEnhancementRequest):
+@app.post("/analyze-and-enhance-profile")
+async def analyze_and_enhance_profile(data: ProfileAnalysisRequest):
+    """Run /analyze-profile and /enhance-profile on the same text concurrently."""
+    return await analyze_and_enhance_profile_text(data.raw_text)
+
+
+@app.post(
+    "/enhance-profile-advanced",
+    response_model=ProfileEnhancementResponse,
+    openapi_extra=json_body_openapi(ProfileEnhancementRequest),
+)
+async def enhance_profile_advanced(
+    request: ProfileEnhancementRequest = Depends(json_body(ProfileEnhancementRequest)),
+):
     """
     Comprehensive profile enhancement with structured, actionable suggestions.
     
@@ -143,7 +197,7 @@ async def enhance_profile_advanced(request: ProfileEnhancementRequest):
     Tailored to target role with focus on recruiter visibility and competitive differentiation.
     """
     safe_target_role = sanitize_log_input(request.target_role)
-    logger.info(f"Profile enhancement requested for target role: {safe_target_role}")
+    logger.info("Profile enhancement requested for target role: %s", safe_target_role)
     
     result = await enhance_profile_service(
         current_headline=request.current_headline,
@@ -157,6 +211,56 @@ async def enhance_profile_advanced(request: ProfileEnhancementRequest):
         company_experience=request.company_experience,
     )
     
-    return result
+    # The service already validated the LLM output into the nested model;
+    # serialize it once instead of letting FastAPI re-validate the whole tree
+    # against response_model (still used for the docs).
+    return Response(content=result.model_dump_json(), media_type="application/json")
+
+
+def _sse_event(event: str, data: dict) -> bytes:
+    """Encode one Server-Sent Event."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data) + b"\n\n"
 
 
+@app.post(
+    "/enhance-profile-advanced/stream",
+    openapi_extra=json_body_openapi(ProfileEnhancementRequest),
+)
+async def enhance_profile_advanced_stream(
+    request: ProfileEnhancementRequest = Depends(json_body(ProfileEnhancementRequest)),
+):
+    """
+    Stream the profile enhancement as Server-Sent Events.
+
+    Sends one `section` event ({"section": name, "data": ...}) per top-level
+    field of ProfileEnhancementResponse as soon as the model has finished
+    writing it, then a `done` event. Failures after the stream has started
+    arrive as an `error` event with a `detail` message.
+    """
+    safe_target_role = sanitize_log_input(request.target_role)
+    logger.info("Streaming profile enhancement for target role: %s", safe_target_role)
+
+    async def events():
+        try:
+            async for name, value in stream_profile_enhancement(
+                current_headline=request.current_headline,
+                about_section=request.about_section,
+                experience_descriptions=request.experience_descriptions,
+                current_skills=request.current_skills,
+                target_role=request.target_role,
+                years_of_experience=request.years_of_experience,
+                featured_section=request.featured_section,
+                industry=request.industry,
+                company_experience=request.company_experience,
+            ):
+                yield _sse_event("section", {"section": name, "data": value})
+        except ValueError as e:
+            logger.warning("Streamed profile enhancement failed: %s", e)
+            yield _sse_event("error", {"detail": str(e)})
+        except Exception as e:
+            logger.error("Unexpected error in streamed profile enhancement: %s", e, exc_info=True)
+            yield _sse_event("error", {"detail": "Failed to enhance profile. Please check your API key and try again."})
+        else:
+            yield _sse_event("done", {})
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -5,41 +5,76 @@ Defines the data contracts for both Comment Mode and Job Mode endpoints.
 All fields are validated automatically by FastAPI.
 """
 
-from pydantic import BaseModel, Field, field_validator
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field, StringConstraints, TypeAdapter
+from typing import Annotated, Any, Literal, Optional
+
+
+# Response-only models are built once from LLM output and never modified,
+# so they are frozen (no per-assignment handling, hashable, safe to share).
+_RESPONSE_CONFIG = ConfigDict(frozen=True)
+
+# Upper bound for free-text inputs that are sent to the LLM, so oversized
+# payloads get a 422 up front instead of a wasted Groq round trip
+MAX_INPUT_TEXT_LENGTH = 20_000
 
 
 # ─── Comment Mode ────────────────────────────────────────────────────────────
 
 class CommentRequest(BaseModel):
     """Incoming request to generate LinkedIn comment suggestions."""
-    post_text: str = Field(..., min_length=10, description="The LinkedIn post text to comment on")
+    post_text: str = Field(..., min_length=10, max_length=MAX_INPUT_TEXT_LENGTH, description="The LinkedIn post text to comment on")
     tone: Optional[str] = Field(None, description="Optional tone preference: supportive, professional, casual")
 
 
+# The five styles the comment prompt asks for
+CommentStyle = Literal["authority", "question", "strategic", "appreciation", "project"]
+
+
 class CommentSuggestion(BaseModel):
     """A single AI-generated comment suggestion."""
-    style: str = Field(..., description="Comment style: authority, question, or strategic")
+    model_config = _RESPONSE_CONFIG
+
+    style: CommentStyle = Field(..., description="Comment style: authority, question, strategic, appreciation, or project")
     comment: str = Field(..., description="The generated comment text")
 
 
 class CommentResponse(BaseModel):
     """Response containing 3 comment suggestions."""
+    model_config = _RESPONSE_CONFIG
+
     post_text: str
     comments: list[CommentSuggestion]
 
 
+CommentPostText = Annotated[str, StringConstraints(min_length=10, max_length=MAX_INPUT_TEXT_LENGTH)]
+
+
+class BatchCommentRequest(BaseModel):
+    """Request to generate comment suggestions for several posts at once."""
+    posts: list[CommentPostText] = Field(..., min_length=1, max_length=10, description="Post texts to comment on (max 10)")
+    tone: Optional[str] = Field(None, description="Optional tone preference: supportive, professional, casual")
+
+
+class BatchCommentResponse(BaseModel):
+    """Comment suggestions for each post, in request order."""
+    model_config = _RESPONSE_CONFIG
+
+    results: list[CommentResponse]
+
+
 # ─── Job Mode ────────────────────────────────────────────────────────────────
 
 class JobAnalysisRequest(BaseModel):
     """Incoming request to analyze a LinkedIn job posting."""
-    job_text: str = Field(..., min_length=10, description="The job posting text or description")
+    job_text: str = Field(..., min_length=10, max_length=MAX_INPUT_TEXT_LENGTH, description="The job posting text or description")
     user_skills: list[str] = Field(default_factory=list, description="User's current skills")
     user_experience: str = Field("", description="Brief summary of user's experience")
 
 
 class JobAnalysisResponse(BaseModel):
     """Structured analysis of a job posting against user's profile."""
+    model_config = _RESPONSE_CONFIG
+
     matched_skills: list[str] = Field(default_factory=list, description="Skills the user already has")
     missing_skills: list[str] = Field(default_factory=list, description="Skills the user should acquire")
     match_percentage: int = Field(0, ge=0, le=100, description="Overall skill match percentage")
@@ -71,6 +106,8 @@ class UserProfileUpdate(BaseModel):
 
 class HeadlineOptimization(BaseModel):
     """Optimized headline with detailed reasoning."""
+    model_config = _RESPONSE_CONFIG
+
     current_headline: str = Field(..., description="Current headline from profile")
     optimized_headline: str = Field(..., description="Rewritten, high-impact headline (max 120 chars)")
     why_stronger: str = Field(..., description="Specific explanation of why it's more compelling")
@@ -80,6 +117,8 @@ class HeadlineOptimization(BaseModel):
 
 class AboutSectionEnhancement(BaseModel):
     """Enhanced About section with positioning and authority."""
+    model_config = _RESPONSE_CONFIG
+
     current_about: str = Field(..., description="Current About section")
     optimized_about: str = Field(..., description="Rewritten About section (3-4 paragraphs)")
     positioning_statement: str = Field(..., description="Clear, one-sentence positioning statement")
@@ -89,6 +128,8 @@ class AboutSectionEnhancement(BaseModel):
 
 class ExperienceImprovement(BaseModel):
     """Improved experience bullet point."""
+    model_config = _RESPONSE_CONFIG
+
     original: str = Field(..., description="Original bullet point from experience")
     improved: str = Field(..., description="Impact-driven rewrite with metrics where possible")
     improvement_reason: str = Field(..., description="Why this is stronger (leadership, ownership, technical depth)")
@@ -97,6 +138,8 @@ class ExperienceImprovement(BaseModel):
 
 class ExperienceSectionImprovements(BaseModel):
     """Complete experience section improvements."""
+    model_config = _RESPONSE_CONFIG
+
     improvements: list[ExperienceImprovement] = Field(default_factory=list, description="Individual bullet point improvements")
     missing_details: list[str] = Field(default_factory=list, description="Suggested missing details to add")
     overall_feedback: str = Field(..., description="Overall feedback on impact and positioning in experience")
@@ -104,6 +147,8 @@ class ExperienceSectionImprovements(BaseModel):
 
 class SkillsStrategy(BaseModel):
     """Strategic recommendations for skills section."""
+    model_config = _RESPONSE_CONFIG
+
     current_skills: list[str] = Field(default_factory=list, description="Skills currently on profile")
     recommended_additions: list[str] = Field(default_factory=list, description="High-value skills to add (tailored to target role)")
     suggested_ordering_strategy: str = Field(..., description="Strategy for ordering skills for maximum impact")
@@ -113,6 +158,8 @@ class SkillsStrategy(BaseModel):
 
 class RecruiterOptimization(BaseModel):
     """Keywords and positioning for recruiter discoverability."""
+    model_config = _RESPONSE_CONFIG
+
     high_value_keywords: list[str] = Field(default_factory=list, description="Keywords recruiters search for (ATS-optimized)")
     suggested_positioning: str = Field(..., description="How to position profile for optimal recruiter discovery")
     search_terms_to_include: list[str] = Field(default_factory=list, description="Specific search terms and phrases to naturally incorporate")
@@ -121,6 +168,8 @@ class RecruiterOptimization(BaseModel):
 
 class DifferentiationAnalysis(BaseModel):
     """Analysis of what makes profile stand out."""
+    model_config = _RESPONSE_CONFIG
+
     tone_consistency: str = Field(..., description="Analysis of tone consistency across profile")
     differentiation_factors: list[str] = Field(default_factory=list, description="What makes this profile unique vs competitors")
     authority_signals: list[str] = Field(default_factory=list, description="Authority signals currently present")
@@ -129,19 +178,26 @@ class DifferentiationAnalysis(BaseModel):
 
 class ProfileEnhancementScore(BaseModel):
     """Overall profile score and priorities."""
+    model_config = _RESPONSE_CONFIG
+
     score_out_of_10: float = Field(0, ge=0, le=10, description="Overall profile score (0-10)")
-    score_breakdown: dict = Field(default_factory=dict, description="Breakdown by section (headline, about, experience, skills, etc.)")
+    score_breakdown: dict[str, Any] = Field(default_factory=dict, description="Breakdown by section (headline, about, experience, skills, etc.)")
     top_3_priorities: list[str] = Field(default_factory=list, description="Top 3 improvement priorities, ranked by impact")
     weeks_to_expert_profile: int = Field(4, description="Estimated weeks to transform profile to expert level")
 
 
+# Each experience description is capped in the core schema, not a Python validator
+MAX_EXPERIENCE_DESCRIPTION_LENGTH = 2000
+ExperienceDescription = Annotated[str, StringConstraints(max_length=MAX_EXPERIENCE_DESCRIPTION_LENGTH)]
+
+
 class ProfileEnhancementRequest(BaseModel):
     """Request for comprehensive profile enhancement."""
     current_headline: str = Field(..., min_length=5, max_length=220, description="Current LinkedIn headline")
     about_section: str = Field(..., min_length=20, max_length=2600, description="Current About section text")
-    experience_descriptions: list[str] = Field(
+    experience_descriptions: list[ExperienceDescription] = Field(
         default_factory=list, 
-        max_items=20,
+        max_length=20,
         description="List of experience bullet points or descriptions (max 20 items, 2000 chars each)"
     )
     current_skills: list[str] = Field(
@@ -154,21 +210,12 @@ class ProfileEnhancementRequest(BaseModel):
     years_of_experience: int = Field(..., ge=0, le=60, description="Total years of professional experience")
     industry: Optional[str] = Field(None, max_length=1000, description="Current/target industry (e.g., 'FinTech', 'SaaS')")
     company_experience: Optional[str] = Field(None, max_length=1000, description="Company types worked at (startups, FAANG, etc.)")
-    
-    @field_validator('experience_descriptions')
-    @classmethod
-    def validate_experience_descriptions(cls, v):
-        """Ensure each experience description is max 2000 characters."""
-        if not isinstance(v, list):
-            return v
-        for i, exp in enumerate(v):
-            if len(exp) > 2000:
-                raise ValueError(f"Experience description {i+1} exceeds 2000 character limit (got {len(exp)} chars)")
-        return v
 
 
 class ProfileEnhancementResponse(BaseModel):
     """Comprehensive profile enhancement response."""
+    model_config = _RESPONSE_CONFIG
+
     headline_optimization: HeadlineOptimization
     about_section_enhancement: AboutSectionEnhancement
     experience_improvements: ExperienceSectionImprovements
@@ -223,6 +270,11 @@ class TrackJobRequest(BaseModel):
     source: str = "manual"
 
 
+# Columns GET /jobs can sort by, and the sort directions it accepts
+JobSortField = Literal["created_at", "match_percentage", "job_title", "company_name", "updated_at"]
+SortOrder = Literal["asc", "desc"]
+
+
 class JobUpdateRequest(BaseModel):
     """Allowed fields for updating a tracked job."""
     status: Optional[str] = None
@@ -241,14 +293,18 @@ class BatchSaveJobsRequest(BaseModel):
     jobs: list[TrackJobRequest] = Field(..., min_length=1, max_length=100, description="Jobs to save (max 100)")
 
 
+# Built once at import and reused for whole-list validation/serialization
+TRACK_JOB_LIST_ADAPTER = TypeAdapter(list[TrackJobRequest])
+
+
 # ─── Profile Analysis ────────────────────────────────────────────────────────
 
 class ProfileAnalysisRequest(BaseModel):
     """Request to analyze raw LinkedIn profile text."""
-    raw_text: str = Field(..., min_length=20, description="Raw LinkedIn profile text to analyze")
+    raw_text: str = Field(..., min_length=20, max_length=MAX_INPUT_TEXT_LENGTH, description="Raw LinkedIn profile text to analyze")
 
 
 class ProfileEnhanceRequest(BaseModel):
     """Request to get AI-powered profile improvement suggestions."""
-    raw_text: str = Field(..., min_length=20, description="Raw LinkedIn profile text to enhance")
+    raw_text: str = Field(..., min_length=20, max_length=MAX_INPUT_TEXT_LENGTH, description="Raw LinkedIn profile text to enhance")
 
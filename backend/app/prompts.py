@@ -1,36 +1,33 @@
 """
-prompts.py – LLM prompt templates for Comment Mode and Job Mode.
+prompts.py – LLM prompt templates for Comment Mode, Job Mode and profile analysis.
 
 Each function returns a formatted system + user prompt pair ready for the
 OpenAI Chat Completions API. Prompts are designed to return valid JSON.
+Static system messages are shared dicts built at import, so callers must
+treat the returned messages as read-only.
 """
 
-import json
+import re
+from functools import lru_cache
 
 
-def build_comment_prompt(post_text: str, tone: str | None = None) -> list[dict]:
-    """
-    Build the messages array for generating 5 LinkedIn comment suggestions.
-
-    Returns 5 styles: authority, question, strategic, appreciation, project.
-    """
-    tone_instruction = ""
-    if tone:
-        tone_instruction = f"\nAdditional tone preference: {tone}."
-
-    system_msg = (
-        "You are a real human LinkedIn user who writes comments the way people actually talk. "
-        "You are NOT an AI assistant. You write like a normal person — casual but professional. "
-        "Your comments sound like someone quickly typing a genuine reaction from their phone. "
-        "NEVER use corporate jargon, buzzwords, or overly polished language. "
-        "NEVER start with 'Great post!' or 'This is so insightful!' — those are obvious AI patterns. "
-        "NEVER use words like: leverage, synergy, resonate, insightful, game-changer, absolutely, kudos, hats off, couldn't agree more. "
-        "Use contractions (it's, don't, I've). Vary sentence length. Be specific, not generic."
-    )
+# ─── Comment Mode ───────────────────────────────────────────────────────────
+# Static prompt text is built once at import; per-request work is one join.
+# Throughout this module the static instructions come first and the request
+# data last, so providers with prompt-prefix caching can reuse the prefix.
 
-    user_msg = f"""Read this LinkedIn post and write 5 different comments as if YOU are a real person genuinely reacting to it.
+_COMMENT_SYSTEM_MSG = (
+    "You are a real human LinkedIn user who writes comments the way people actually talk. "
+    "You are NOT an AI assistant. You write like a normal person — casual but professional. "
+    "Your comments sound like someone quickly typing a genuine reaction from their phone. "
+    "NEVER use corporate jargon, buzzwords, or overly polished language. "
+    "NEVER start with 'Great post!' or 'This is so insightful!' — those are obvious AI patterns. "
+    "NEVER use words like: leverage, synergy, resonate, insightful, game-changer, absolutely, kudos, hats off, couldn't agree more. "
+    "Use contractions (it's, don't, I've). Vary sentence length. Be specific, not generic."
+)
+_COMMENT_SYSTEM_DICT = {"role": "system", "content": _COMMENT_SYSTEM_MSG}
 
-Write each comment in a different style:
+_COMMENT_STYLE_RULES = """Write each comment in a different style:
 1. **Authority** – Share a quick personal take or experience related to the topic. Like you've been there and have something real to add.
 2. **Question** – Ask something you're genuinely curious about. Not a generic question — something specific to what they said.
 3. **Strategic** – Add your own perspective that moves the conversation forward. Maybe mention a related idea or offer to connect on the topic.
@@ -46,59 +43,103 @@ CRITICAL RULES for sounding human:
 - One emoji max per comment (or none) — real people don't spam emojis
 - Imperfect is better than polished — real comments aren't perfect
 - DO NOT include hashtags
-- DO NOT use quotation marks around their words{tone_instruction}
+- DO NOT use quotation marks around their words"""
+
+_COMMENT_USER_HEAD = (
+    "Read this LinkedIn post and write 5 different comments as if YOU are a real person genuinely reacting to it.\n\n"
+    + _COMMENT_STYLE_RULES
+)
+
+# One line instead of a pretty-printed example: same schema, fewer prompt tokens.
+# The format comes before the post so everything ahead of post_text is static.
+_COMMENT_USER_TAIL = """
+
+Respond with ONLY valid JSON in this exact format:
+{"comments": [{"style": "authority", "comment": "..."}, {"style": "question", "comment": "..."}, {"style": "strategic", "comment": "..."}, {"style": "appreciation", "comment": "..."}, {"style": "project", "comment": "..."}]}
 
 LinkedIn Post:
 \"\"\"
-{post_text}
-\"\"\"
+"""
 
-Respond with ONLY valid JSON in this exact format:
-{{
-  "comments": [
-    {{"style": "authority", "comment": "..."}},
-    {{"style": "question", "comment": "..."}},
-    {{"style": "strategic", "comment": "..."}},
-    {{"style": "appreciation", "comment": "..."}},
-    {{"style": "project", "comment": "..."}}
-  ]
-}}"""
+_COMMENT_USER_END = """
+\"\"\""""
 
-    return [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg},
-    ]
 
+def _comment_user_prefix(tone: str | None) -> str:
+    """Everything in the comment user message before the post text."""
+    tone_instruction = f"\nAdditional tone preference: {tone}." if tone else ""
+    return _COMMENT_USER_HEAD + tone_instruction + _COMMENT_USER_TAIL
 
-def build_job_analysis_prompt(
-    job_text: str,
-    user_skills: list[str],
-    user_experience: str,
-) -> list[dict]:
+
+# The tones the extension offers, specialized once so the common case is a lookup
+_COMMENT_USER_PREFIXES = {
+    tone: _comment_user_prefix(tone)
+    for tone in (None, "supportive", "professional", "casual")
+}
+
+
+def build_comment_prompt(post_text: str, tone: str | None = None) -> list[dict]:
     """
-    Build the messages array for analyzing a job posting against a user profile.
+    Build the messages array for generating 5 LinkedIn comment suggestions.
 
-    Returns matched/missing skills, a personalized application note,
-    resume improvement tips, and similar roles to explore.
+    Returns 5 styles: authority, question, strategic, appreciation, project.
+    """
+    prefix = _COMMENT_USER_PREFIXES.get(tone or None)
+    if prefix is None:
+        prefix = _comment_user_prefix(tone)
+
+    user_msg = "".join((prefix, post_text, _COMMENT_USER_END))
+
+    return [_COMMENT_SYSTEM_DICT, {"role": "user", "content": user_msg}]
+
+
+# Several posts in one request: each post gets an id the response echoes back.
+_COMMENT_BATCH_USER_HEAD = (
+    "Read each LinkedIn post below and, for every post, write 5 different comments as if YOU are a real person genuinely reacting to it.\n\n"
+    + _COMMENT_STYLE_RULES
+)
+
+_COMMENT_BATCH_USER_TAIL = """
+
+Respond with ONLY valid JSON in this exact format, with one entry per post id:
+{"results": [{"id": 0, "comments": [{"style": "authority", "comment": "..."}, {"style": "question", "comment": "..."}, {"style": "strategic", "comment": "..."}, {"style": "appreciation", "comment": "..."}, {"style": "project", "comment": "..."}]}]}
+
+LinkedIn Posts:"""
+
+
+def build_comment_batch_prompt(posts: list[str], tone: str | None = None) -> list[dict]:
     """
-    skills_str = ", ".join(user_skills) if user_skills else "Not provided"
+    Build the messages array for generating 5 comment suggestions for each
+    of several posts in one request.
 
-    system_msg = (
-        "You are an expert career coach and resume strategist. "
-        "You help professionals analyze job postings and optimize their applications. "
-        "Be specific, actionable, and encouraging."
+    Each post is identified by its index in `posts`, which the response
+    echoes back as "id".
+    """
+    tone_instruction = f"\nAdditional tone preference: {tone}." if tone else ""
+    post_blocks = "".join(
+        f'\n\n[id {i}]\n"""\n{post}\n"""' for i, post in enumerate(posts)
     )
+    user_msg = "".join((_COMMENT_BATCH_USER_HEAD, tone_instruction, _COMMENT_BATCH_USER_TAIL, post_blocks))
 
-    user_msg = f"""Analyze the following job posting against the candidate's profile.
+    return [_COMMENT_SYSTEM_DICT, {"role": "user", "content": user_msg}]
 
-**Job Posting:**
-\"\"\"
-{job_text}
-\"\"\"
 
-**Candidate Profile:**
-- Skills: {skills_str}
-- Experience: {user_experience if user_experience else "Not provided"}
+@lru_cache(maxsize=256)
+def _join_skills(skills: tuple[str, ...]) -> str:
+    """Comma-join a skills list; cached since one profile is reused across jobs."""
+    return ", ".join(skills)
+
+
+# ─── Job Mode ───────────────────────────────────────────────────────────────
+
+_JOB_SYSTEM_MSG = (
+    "You are an expert career coach and resume strategist. "
+    "You help professionals analyze job postings and optimize their applications. "
+    "Be specific, actionable, and encouraging."
+)
+_JOB_SYSTEM_DICT = {"role": "system", "content": _JOB_SYSTEM_MSG}
+
+_JOB_USER_HEAD = """Analyze the job posting below against the candidate's profile below.
 
 Provide a comprehensive analysis with:
 1. **Matched Skills** – Skills the candidate already has that match the job requirements.
@@ -109,77 +150,153 @@ Provide a comprehensive analysis with:
 6. **Similar Roles** – 3–5 related job titles the candidate could also explore.
 
 Respond with ONLY valid JSON in this exact format:
-{{
+{
   "matched_skills": ["skill1", "skill2"],
   "missing_skills": ["skill3", "skill4"],
   "match_percentage": 75,
   "personalized_note": "...",
   "resume_tips": ["tip1", "tip2", "tip3"],
   "similar_roles": ["role1", "role2", "role3"]
-}}"""
+}"""
 
-    return [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg},
-    ]
 
-
-def build_profile_enhancement_prompt(
-    current_headline: str,
-    about_section: str,
-    experience_descriptions: list[str],
-    current_skills: list[str],
-    featured_section: str | None,
-    target_role: str,
-    years_of_experience: int,
-    industry: str | None,
-    company_experience: str | None,
+def build_job_analysis_prompt(
+    job_text: str,
+    user_skills: list[str],
+    user_experience: str,
 ) -> list[dict]:
     """
-    Build the messages array for comprehensive profile enhancement.
-    
-    Returns structured, actionable, and high-impact profile optimization suggestions
-    tailored to the target role, with specific rewritten examples and authority signals.
+    Build the messages array for analyzing a job posting against a user profile.
+
+    Returns matched/missing skills, a personalized application note,
+    resume improvement tips, and similar roles to explore.
     """
-    
-    experience_str = "\n".join([f"- {exp}" for exp in experience_descriptions]) if experience_descriptions else "Not provided"
-    skills_str = ", ".join(current_skills) if current_skills else "Not provided"
-    featured_str = featured_section if featured_section else "Not provided"
-    industry_str = industry if industry else "Not specified"
-    company_str = company_experience if company_experience else "Not specified"
-    
-    system_msg = (
-        "You are a world-class LinkedIn personal branding strategist, recruiter, and AI system architect. "
-        "Your expertise spans compensation negotiation, executive positioning, and tech talent acquisition across FAANG and top startups. "
-        "You understand what makes elite LinkedIn profiles stand out to top recruiters and how authority signals influence hiring decisions. "
-        "You provide ZERO generic advice — every suggestion is specific, rewritten, and directly applicable. "
-        "You focus on positioning, authority, competitive differentiation, and measurable impact. "
-        "You understand that in AI/Backend roles, depth, innovation, and leadership are what separate top 1% candidates from the rest. "
-        "Your tone is professional, confident, modern, and never corporate-buzzword heavy."
-    )
-    
-    user_msg = f"""Analyze and enhance this LinkedIn profile for competitive positioning as a {target_role}.
+    skills_str = _join_skills(tuple(user_skills)) if user_skills else "Not provided"
 
-CURRENT PROFILE:
-───────────────
-Headline: {current_headline}
+    user_msg = _JOB_USER_HEAD + f"""
 
-About Section:
-{about_section}
+**Candidate Profile:**
+- Skills: {skills_str}
+- Experience: {user_experience if user_experience else "Not provided"}
 
-Experience Bullets:
-{experience_str}
+**Job Posting:**
+\"\"\"
+{job_text}
+\"\"\""""
 
-Current Skills:
-{skills_str}
+    return [_JOB_SYSTEM_DICT, {"role": "user", "content": user_msg}]
 
-Featured Section:
-{featured_str}
 
-Target Role: {target_role}
-Years of Experience: {years_of_experience}
-Industry Context: {industry_str}
-Company Background: {company_str}
+# ─── Profile Text Mode ──────────────────────────────────────────────────────
+# Raw profile text pasted by the user; only the first 2500 chars are sent.
+# Text copied off the page is full of indentation and blank-line runs, so
+# whitespace is collapsed first and the budget goes to actual content.
+
+PROFILE_TEXT_MAX_CHARS = 2500
+
+_LINE_BREAK_RE = re.compile(r"\s*\n\s*")
+_INLINE_WHITESPACE_RE = re.compile(r"[^\S\n]+")
+
+
+def _line_break(match: re.Match) -> str:
+    return "\n\n" if match.group().count("\n") > 1 else "\n"
+
+
+def _compact_profile_text(raw_text: str) -> str:
+    """Collapse whitespace runs and trim to PROFILE_TEXT_MAX_CHARS."""
+    text = _LINE_BREAK_RE.sub(_line_break, raw_text.strip())
+    return _INLINE_WHITESPACE_RE.sub(" ", text)[:PROFILE_TEXT_MAX_CHARS]
+
+_PROFILE_EXTRACT_SYSTEM_MSG = (
+    "You are a profile analyzer. Extract structured information from LinkedIn profile text. "
+    "Return clean, organized data. Be concise and accurate."
+)
+_PROFILE_EXTRACT_SYSTEM_DICT = {"role": "system", "content": _PROFILE_EXTRACT_SYSTEM_MSG}
+
+_PROFILE_EXTRACT_USER_HEAD = """Extract the following from the LinkedIn profile text below and return as JSON:
+
+1. **name** – Full name of the person
+2. **skills** – List of technical and professional skills (as an array of strings, max 15)
+3. **experience** – A 1-2 sentence summary of their professional experience (years, roles, industries)
+4. **summary** – A 2-3 sentence professional bio based on their profile
+
+Respond with ONLY valid JSON:
+{
+  "name": "...",
+  "skills": ["skill1", "skill2", "..."],
+  "experience": "...",
+  "summary": "..."
+}
+
+LinkedIn Profile Text:
+\"\"\"
+"""
+
+_PROFILE_REVIEW_SYSTEM_MSG = (
+    "You are a LinkedIn profile optimization expert and personal branding coach. "
+    "You help professionals make their LinkedIn profiles stand out to recruiters, "
+    "clients, and connections. Be specific, actionable, and encouraging."
+)
+_PROFILE_REVIEW_SYSTEM_DICT = {"role": "system", "content": _PROFILE_REVIEW_SYSTEM_MSG}
+
+_PROFILE_REVIEW_USER_HEAD = """Analyze the LinkedIn profile below and provide specific improvement suggestions.
+
+Provide a comprehensive profile review with:
+1. **profile_score** – Rate the profile out of 100 based on completeness, clarity, and impact.
+2. **headline_suggestion** – Write a better, more compelling headline (max 120 chars). If it's already great, explain why.
+3. **about_rewrite** – Write an improved About section (3-4 paragraphs) that tells their story, highlights achievements, and includes a call-to-action. Make it sound human, not corporate.
+4. **skills_to_add** – List 5-8 skills they should add to their profile based on their experience.
+5. **tips** – 4-6 specific, actionable tips to improve their overall LinkedIn presence (not just profile text — include activity, engagement, networking advice).
+
+Respond with ONLY valid JSON:
+{
+  "profile_score": 65,
+  "headline_suggestion": "...",
+  "about_rewrite": "...",
+  "skills_to_add": ["skill1", "skill2"],
+  "tips": ["tip1", "tip2", "tip3", "tip4"]
+}
+
+LinkedIn Profile:
+\"\"\"
+"""
+
+_PROFILE_TEXT_USER_END = '\n"""'
+
+
+def build_profile_extract_prompt(raw_text: str) -> list[dict]:
+    """
+    Build the messages array for extracting name, skills, experience and
+    summary from raw LinkedIn profile text.
+    """
+    user_msg = "".join((_PROFILE_EXTRACT_USER_HEAD, _compact_profile_text(raw_text), _PROFILE_TEXT_USER_END))
+    return [_PROFILE_EXTRACT_SYSTEM_DICT, {"role": "user", "content": user_msg}]
+
+
+def build_profile_review_prompt(raw_text: str) -> list[dict]:
+    """
+    Build the messages array for scoring raw LinkedIn profile text and
+    suggesting a headline, About rewrite, skills and tips.
+    """
+    user_msg = "".join((_PROFILE_REVIEW_USER_HEAD, _compact_profile_text(raw_text), _PROFILE_TEXT_USER_END))
+    return [_PROFILE_REVIEW_SYSTEM_DICT, {"role": "user", "content": user_msg}]
+
+
+# ─── Profile Enhancement ────────────────────────────────────────────────────
+
+_PROFILE_SYSTEM_MSG = (
+    "You are a world-class LinkedIn personal branding strategist, recruiter, and AI system architect. "
+    "Your expertise spans compensation negotiation, executive positioning, and tech talent acquisition across FAANG and top startups. "
+    "You understand what makes elite LinkedIn profiles stand out to top recruiters and how authority signals influence hiring decisions. "
+    "You provide ZERO generic advice — every suggestion is specific, rewritten, and directly applicable. "
+    "You focus on positioning, authority, competitive differentiation, and measurable impact. "
+    "You understand that in AI/Backend roles, depth, innovation, and leadership are what separate top 1% candidates from the rest. "
+    "Your tone is professional, confident, modern, and never corporate-buzzword heavy."
+)
+_PROFILE_SYSTEM_DICT = {"role": "system", "content": _PROFILE_SYSTEM_MSG}
+
+
+_PROFILE_USER_HEAD = """You are analyzing and enhancing a LinkedIn profile for competitive positioning in a target role. The profile and target role are at the end of this message.
 
 CRITICAL INSTRUCTIONS:
 ─────────────────────
@@ -188,138 +305,208 @@ You are a senior LinkedIn branding consultant analyzing this profile. Provide ZE
 - Every about section must have a clear structure with positioning, authority, and vision
 - Every experience improvement must include why it's stronger and what metrics could be added
 - Every skill recommendation must be proven high-value for this specific target role
-- All suggestions must differentiate from competitors in the {target_role} space
+- All suggestions must differentiate from competitors in the target role space
 - Tone must be professional, confident, modern (never corporate jargon)
 - Focus on what makes candidates hireable to top-tier tech companies
 
 Your analysis must address:
 1. TONE CONSISTENCY across the profile
-2. DIFFERENTIATION from other {target_role} candidates
+2. DIFFERENTIATION from other candidates for the target role
 3. AUTHORITY SIGNALS (credentials, depth, impact)
 4. COMPETITIVE ADVANTAGES in a crowded AI/Backend market
 5. HOW TO STAND OUT to top-tier recruiters and hiring managers
 
 RESPOND WITH ONLY VALID JSON - NO EXPLANATIONS OUTSIDE JSON:
 
-{{
-  "headline_optimization": {{
-    "current_headline": "{current_headline}",
-    "optimized_headline": "Write a concise, high-impact headline (max 120 chars) that speaks directly to {target_role} requirements. Be specific. Example: 'AI/ML Backend Engineer | Python/FastAPI/LLMs | Built Recommendation Systems @ Scale'",
+{
+  "headline_optimization": {
+    "current_headline": "Copy the Headline from the profile below",
+    "optimized_headline": "Write a concise, high-impact headline (max 120 chars) that speaks directly to the target role's requirements. Be specific. Example: 'AI/ML Backend Engineer | Python/FastAPI/LLMs | Built Recommendation Systems @ Scale'",
     "why_stronger": "Explain specifically why this is more compelling — what keywords, tone, authority signals make it stand out vs generic headlines",
     "keyword_suggestions": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5"],
     "char_count": 0
-  }},
-  "about_section_enhancement": {{
-    "current_about": "{about_section[:500]}...",
+  },
+  "about_section_enhancement": {
+    "current_about": "Copy the first 500 characters of the About Section from the profile below, followed by ...",
     "optimized_about": "Rewrite the entire About section (3-4 tight paragraphs). Structure: [HOOK - grab attention with credibility] [EXPERTISE - deep technical positioning] [IMPACT - measurable results/outcomes] [VISION - future direction/what you're solving]. Make it human, confident, modern.",
-    "positioning_statement": "Write one clear sentence that positions them uniquely as a {target_role} — this should be the core differentiator",
+    "positioning_statement": "Write one clear sentence that positions them uniquely for the target role — this should be the core differentiator",
     "authority_elements": ["element1", "element2", "element3", "element4"],
     "structure_explanation": "Explain how the optimized about follows hook → expertise → impact → vision framework and why each element matters"
-  }},
-  "experience_improvements": {{
+  },
+  "experience_improvements": {
     "improvements": [
-      {{
+      {
         "original": "First experience bullet from list",
         "improved": "Rewrite this bullet to be impact-driven. Add metrics where possible. Highlight leadership, ownership, technical depth.",
         "improvement_reason": "Specifically explain why the improved version is stronger — what was generic vs specific, what metrics add proof",
         "metrics_added": "If metrics were added, mention them. Otherwise null."
-      }}
+      }
     ],
     "missing_details": ["detail1", "detail2"],
-    "overall_feedback": "2-3 sentences on how to position experience section for {target_role} visibility and impact"
-  }},
-  "skills_strategy": {{
-    "current_skills": {json.dumps(skills_str.split(", ") if skills_str != "Not provided" else [])},
+    "overall_feedback": "2-3 sentences on how to position experience section for visibility and impact in the target role"
+  },
+  "skills_strategy": {
+    "current_skills": ["Copy each skill from Current Skills in the profile below; empty array if not provided"],
     "recommended_additions": ["skill1", "skill2", "skill3", "skill4", "skill5"],
-    "suggested_ordering_strategy": "Explain EXACTLY how to order skills for maximum recruiter impact in {target_role} searches",
+    "suggested_ordering_strategy": "Explain EXACTLY how to order skills for maximum recruiter impact in searches for the target role",
     "niche_positioning": ["niche1", "niche2", "niche3"],
     "skills_to_deemphasize": ["generic_skill1"]
-  }},
-  "recruiter_optimization": {{
+  },
+  "recruiter_optimization": {
     "high_value_keywords": ["keyword1", "keyword2", "keyword3", "keyword4", "keyword5", "keyword6", "keyword7"],
-    "suggested_positioning": "How to position the profile to show up in recruiter searches for {target_role} roles at top companies",
+    "suggested_positioning": "How to position the profile to show up in recruiter searches for target role positions at top companies",
     "search_terms_to_include": ["search_term1", "search_term2", "search_term3"],
     "visibility_recommendations": ["recommendation1", "recommendation2", "recommendation3"]
-  }},
-  "differentiation_analysis": {{
+  },
+  "differentiation_analysis": {
     "tone_consistency": "Analyze if tone is consistent — is it confident? modern? or corporate-buzzword heavy? What to fix.",
     "differentiation_factors": ["factor1", "factor2", "factor3"],
     "authority_signals": ["signal1", "signal2", "signal3"],
     "competitive_advantages": ["advantage1", "advantage2"]
-  }},
-  "overall_score": {{
+  },
+  "overall_score": {
     "score_out_of_10": 6.5,
-    "score_breakdown": {{
+    "score_breakdown": {
       "headline": 5,
       "about_section": 6,
       "experience": 7,
       "skills": 6,
       "authority_signals": 5,
       "differentiation": 4
-    }},
+    },
     "top_3_priorities": [
       "Priority 1 (most impactful): specific action with reasoning",
       "Priority 2: specific action with reasoning",
       "Priority 3: specific action with reasoning"
     ],
     "weeks_to_expert_profile": 4
-  }},
-  "executive_summary": "2-3 sentence summary of the biggest opportunities and concrete next steps to position as a top-tier {target_role} candidate"
-}}
-"""
+  },
+  "executive_summary": "2-3 sentence summary of the biggest opportunities and concrete next steps to position as a top-tier candidate for the target role"
+}"""
+
+
+def build_profile_enhancement_prompt(
+    current_headline: str,
+    about_section: str,
+    experience_descriptions: list[str],
+    current_skills: list[str],
+    featured_section: str | None,
+    target_role: str,
+    years_of_experience: int,
+    industry: str | None,
+    company_experience: str | None,
+) -> list[dict]:
+    """
+    Build the messages array for comprehensive profile enhancement.
+    
+    Returns structured, actionable, and high-impact profile optimization suggestions
+    tailored to the target role, with specific rewritten examples and authority signals.
+    """
+    
+    experience_str = "- " + "\n- ".join(experience_descriptions) if experience_descriptions else "Not provided"
+    skills_str = _join_skills(tuple(current_skills)) if current_skills else "Not provided"
+    featured_str = featured_section if featured_section else "Not provided"
+    industry_str = industry if industry else "Not specified"
+    company_str = company_experience if company_experience else "Not specified"
     
-    return [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg},
-    ]
+    user_msg = _PROFILE_USER_HEAD + f"""
+
+Analyze and enhance this LinkedIn profile for competitive positioning as a {target_role}.
+
+CURRENT PROFILE:
+───────────────
+Headline: {current_headline}
 
+About Section:
+{about_section}
+
+Experience Bullets:
+{experience_str}
 
-def build_job_batch_scoring_prompt(job: dict, user_profile: dict) -> list[dict]:
+Current Skills:
+{skills_str}
+
+Featured Section:
+{featured_str}
+
+Target Role: {target_role}
+Years of Experience: {years_of_experience}
+Industry Context: {industry_str}
+Company Background: {company_str}"""
+    
+    return [_PROFILE_SYSTEM_DICT, {"role": "user", "content": user_msg}]
+
+
+# ─── Batch Scoring ──────────────────────────────────────────────────────────
+
+_BATCH_SCORE_SYSTEM_MSG = (
+    "You are a job match scoring expert. "
+    "Quickly analyze how well a job matches a candidate's profile. "
+    "Return ONLY valid JSON with no markdown, no explanations. "
+    "Be fast and practical — this is for real-time UI feedback on job search pages."
+)
+_BATCH_SCORE_SYSTEM_DICT = {"role": "system", "content": _BATCH_SCORE_SYSTEM_MSG}
+
+_BATCH_SCORE_USER_HEAD = """Analyze each job opening below and score how well it matches the candidate below.
+
+Return ONLY this JSON (no markdown, no extra text), with exactly one entry per job opening, using its id:
+{
+  "results": [
+    {
+      "id": <the job opening's id>,
+      "match_percentage": <0-100 integer>,
+      "ranking_level": "<'high' if 70+, 'medium' if 50-70, 'low' if <50>",
+      "matched_skills": [<top 3 skills from candidate that appear in job>],
+      "missing_skills": [<top 3 skills candidate lacks for this role>],
+      "summary": "<1 sentence reason for the score>"
+    }
+  ]
+}"""
+
+
+def build_job_batch_scoring_prompt(jobs: list[dict], user_profile: dict) -> list[dict]:
     """
     Build prompt for batch job scoring (fast, lightweight scoring for overlays).
 
-    Returns match_percentage, ranking_level, matched_skills, missing_skills, summary.
+    Scores several jobs in one call; each job is identified by its index in
+    `jobs`, which the response echoes back as "id". Returns match_percentage,
+    ranking_level, matched_skills, missing_skills, summary per job.
     Used for real-time feedback on LinkedIn job search results.
     """
-    job_title = job.get("job_title", "")
-    company = job.get("company_name", "")
-    location = job.get("location", "")
-    description = job.get("description", "")[:1500]  # Limit to 1500 chars for speed
-    
-    user_skills = ", ".join(user_profile.get("skills", []))
-    target_role = user_profile.get("target_role", "")
-    experience = user_profile.get("experience", "")
-    
-    system_msg = (
-        "You are a job match scoring expert. "
-        "Quickly analyze how well a job matches a candidate's profile. "
-        "Return ONLY valid JSON with no markdown, no explanations. "
-        "Be fast and practical — this is for real-time UI feedback on job search pages."
+    prefix = _batch_score_user_prefix(
+        tuple(user_profile.get("skills", [])),
+        user_profile.get("experience", ""),
+        user_profile.get("target_role", ""),
+    )
+    job_blocks = "\n\n".join(
+        f"""[id {i}]
+- Title: {job.get("job_title", "")}
+- Company: {job.get("company_name", "")}
+- Location: {job.get("location", "")}
+- Description: {job.get("description", "")[:1500]}"""  # Limit to 1500 chars for speed
+        for i, job in enumerate(jobs)
     )
     
-    user_msg = f"""Analyze this job opening and score how well it matches the candidate:
+    user_msg = prefix + job_blocks
+    
+    return [_BATCH_SCORE_SYSTEM_DICT, {"role": "user", "content": user_msg}]
+
+
+@lru_cache(maxsize=32)
+def _batch_score_user_prefix(skills: tuple[str, ...], experience: str, target_role: str) -> str:
+    """
+    Everything in the batch-scoring user message before the job blocks.
+
+    The candidate block is the same for every group in a batch (and across
+    rescans), so it is built once and goes before the jobs to extend the
+    shared prefix.
+    """
+    return _BATCH_SCORE_USER_HEAD + f"""
 
 CANDIDATE PROFILE:
-- Skills: {user_skills}
+- Skills: {_join_skills(skills)}
 - Experience: {experience}
 - Target Role: {target_role}
 
-JOB OPENING:
-- Title: {job_title}
-- Company: {company}
-- Location: {location}
-- Description: {description}
-
-Return ONLY this JSON (no markdown, no extra text):
-{{
-  "match_percentage": <0-100 integer>,
-  "ranking_level": "<'high' if 70+, 'medium' if 50-70, 'low' if <50>",
-  "matched_skills": [<top 3 skills from candidate that appear in job>],
-  "missing_skills": [<top 3 skills candidate lacks for this role>],
-  "summary": "<1 sentence reason for the score>"
-}}"""
-    
-    return [
-        {"role": "system", "content": system_msg},
-        {"role": "user", "content": user_msg},
-    ]
+JOB OPENINGS:
+"""
@@ -3,6 +3,7 @@ backend/app/routers/batch_scoring.py
 
 Batch job scoring and job tracking endpoints for Dashboard v2.0:
 - POST /batch-score-jobs: Score multiple jobs in batch
+- POST /batch-score-jobs/stream: Same, streamed as NDJSON
 - POST /jobs/track: Save a tracked job
 - GET /jobs: List tracked jobs with pagination/filtering
 - GET /jobs/{id}: Get single job
@@ -11,20 +12,28 @@ Batch job scoring and job tracking endpoints for Dashboard v2.0:
 - GET /jobs/stats: Dashboard statistics
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from typing import Optional, List
-from datetime import datetime
 import logging
+import orjson
+import time
+import uuid
 
 from ..models import (
     BatchScoreRequest,
     TrackJobRequest,
     JobUpdateRequest,
     BatchSaveJobsRequest,
+    JobSortField,
+    SortOrder,
+    TRACK_JOB_LIST_ADAPTER,
 )
-from ..services import match_jobs_batch_service
+from ..dependencies import json_body, json_body_openapi
+from ..services import match_jobs_batch_service, iter_jobs_batch_scores
 from ..database import (
     save_tracked_job,
+    save_tracked_jobs_bulk,
     get_tracked_job,
     list_tracked_jobs,
     update_tracked_job,
@@ -36,26 +45,28 @@ router = APIRouter(prefix="/jobs", tags=["job-tracking"])
 logger = logging.getLogger(__name__)
 
 
-@router.post("/batch-score-jobs")
-async def batch_score_jobs(request: BatchScoreRequest):
+@router.post("/batch-score-jobs", openapi_extra=json_body_openapi(BatchScoreRequest))
+async def batch_score_jobs(request: BatchScoreRequest = Depends(json_body(BatchScoreRequest))):
     """Score multiple jobs against user profile in batch."""
     try:
-        jobs = [job.model_dump() for job in request.jobs]
-        user_profile = request.user_profile.model_dump()
+        # One dump walks the whole request (jobs and profile) in pydantic-core
+        dumped = request.model_dump(exclude={"quick_mode"})
+        jobs = dumped["jobs"]
+        user_profile = dumped["user_profile"]
 
-        logger.info(f"[Batch Scoring] Processing {len(jobs)} jobs (quick_mode={request.quick_mode})")
+        logger.info("[Batch Scoring] Processing %d jobs (quick_mode=%s)", len(jobs), request.quick_mode)
 
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         results = await match_jobs_batch_service(
             jobs=jobs,
             user_profile=user_profile,
             quick_mode=request.quick_mode,
         )
-        elapsed_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
+        elapsed_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
 
-        batch_id = f"batch_{datetime.utcnow().timestamp()}"
+        batch_id = f"batch_{uuid.uuid4().hex}"
 
-        logger.info(f"[Batch Scoring] Completed batch {batch_id}: {len(results)} results in {elapsed_ms}ms")
+        logger.info("[Batch Scoring] Completed batch %s: %d results in %dms", batch_id, len(results), elapsed_ms)
 
         return {
             "success": True,
@@ -69,24 +80,46 @@ async def batch_score_jobs(request: BatchScoreRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[Batch Scoring] Error: {e}", exc_info=True)
+        logger.error("[Batch Scoring] Error: %s", e, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail="Batch scoring failed: " + str(e)
         )
 
 
+@router.post("/batch-score-jobs/stream", openapi_extra=json_body_openapi(BatchScoreRequest))
+async def batch_score_jobs_stream(request: BatchScoreRequest = Depends(json_body(BatchScoreRequest))):
+    """
+    Score multiple jobs, streaming each result as NDJSON as soon as it is ready.
+
+    Each line is one result object, as in the `results` list of
+    /batch-score-jobs, in completion order; match them up by job_id.
+    """
+    dumped = request.model_dump(exclude={"quick_mode"})
+    logger.info("[Batch Scoring] Streaming %d jobs (quick_mode=%s)", len(dumped["jobs"]), request.quick_mode)
+
+    async def lines():
+        async for result in iter_jobs_batch_scores(
+            jobs=dumped["jobs"],
+            user_profile=dumped["user_profile"],
+            quick_mode=request.quick_mode,
+        ):
+            yield orjson.dumps(result) + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.post("/track")
 async def track_job(request: TrackJobRequest):
     """Save an analyzed job to user's tracking dashboard."""
     try:
         job_data = request.model_dump()
         job = await save_tracked_job(job_data)
-        logger.info(f"[Track Job] Saved {request.job_title} at {request.company_name}")
+        logger.info("[Track Job] Saved %s at %s", request.job_title, request.company_name)
         return {"success": True, "job": job}
 
     except Exception as e:
-        logger.error(f"[Track Job] Error: {e}")
+        logger.error("[Track Job] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -97,8 +130,9 @@ async def list_jobs(
     status: Optional[str] = None,
     minMatch: Optional[int] = Query(None, ge=0, le=100),
     search: Optional[str] = None,
-    sortBy: str = "created_at",
-    sortOrder: str = Query("desc", regex="^(asc|desc)$"),
+    sortBy: JobSortField = "created_at",
+    sortOrder: SortOrder = "desc",
+    cursor: Optional[str] = None,
 ):
     """
     List tracked jobs with filtering, sorting, pagination.
@@ -107,6 +141,10 @@ async def list_jobs(
     - GET /jobs?page=1&pageSize=10&status=new
     - GET /jobs?page=1&minMatch=70&sortBy=match_percentage
     - GET /jobs?search=Python&sortOrder=asc
+    - GET /jobs?pageSize=10&cursor=<next_cursor from previous page>
+
+    With a cursor, pages are fetched by keyset (constant cost at any depth)
+    and total/totalPages are null.
     """
     try:
         filters = {}
@@ -122,19 +160,24 @@ async def list_jobs(
             search=search,
             sortBy=sortBy,
             sortOrder=sortOrder,
+            cursor=cursor,
         )
 
+        total = result["total"]
         return {
             "success": True,
             "jobs": result["jobs"],
-            "total": result["total"],
+            "total": total,
             "page": page,
             "pageSize": pageSize,
-            "totalPages": (result["total"] + pageSize - 1) // pageSize,
+            "totalPages": (total + pageSize - 1) // pageSize if total is not None else None,
+            "next_cursor": result["next_cursor"],
         }
 
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"[List Jobs] Error: {e}")
+        logger.error("[List Jobs] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -152,7 +195,7 @@ async def get_stats():
         return {"success": True, "stats": stats}
 
     except Exception as e:
-        logger.error(f"[Get Stats] Error: {e}")
+        logger.error("[Get Stats] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 
@@ -161,65 +204,57 @@ async def get_job(job_id: str):
     """Get a single tracked job by ID"""
     try:
         job = await get_tracked_job(job_id)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-        return {"success": True, "job": job}
-
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"[Get Job] Error: {e}")
+        logger.error("[Get Job] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return {"success": True, "job": job}
+
 
 @router.put("/{job_id}")
 async def update_job(job_id: str, updates: JobUpdateRequest):
     """Update job metadata (status, notes, dates, salary)."""
+    filtered_updates = updates.model_dump(exclude_none=True)
     try:
-        filtered_updates = updates.model_dump(exclude_none=True)
-
         job = await update_tracked_job(job_id, filtered_updates)
-        if not job:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        logger.info(f"[Update Job] Updated job {job_id}")
-        return {"success": True, "job": job}
-
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"[Update Job] Error: {e}")
+        logger.error("[Update Job] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    logger.info("[Update Job] Updated job %s", job_id)
+    return {"success": True, "job": job}
+
 
 @router.delete("/{job_id}")
 async def delete_job(job_id: str):
     """Delete a tracked job"""
     try:
         success = await delete_tracked_job(job_id)
-        if not success:
-            raise HTTPException(status_code=404, detail="Job not found")
-
-        logger.info(f"[Delete Job] Deleted job {job_id}")
-        return {"success": True, "message": "Job deleted"}
-
-    except HTTPException:
-        raise
     except Exception as e:
-        logger.error(f"[Delete Job] Error: {e}")
+        logger.error("[Delete Job] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+    if not success:
+        raise HTTPException(status_code=404, detail="Job not found")
 
-@router.post("/batch")
-async def batch_save_jobs(request: BatchSaveJobsRequest):
+    logger.info("[Delete Job] Deleted job %s", job_id)
+    return {"success": True, "message": "Job deleted"}
+
+
+@router.post("/batch", openapi_extra=json_body_openapi(BatchSaveJobsRequest))
+async def batch_save_jobs(request: BatchSaveJobsRequest = Depends(json_body(BatchSaveJobsRequest))):
     """Bulk save multiple jobs (for importing/migration, max 100)."""
     try:
-        saved_jobs = []
-        for job_req in request.jobs:
-            job = await save_tracked_job(job_req.model_dump())
-            saved_jobs.append(job)
+        saved_jobs = await save_tracked_jobs_bulk(
+            TRACK_JOB_LIST_ADAPTER.dump_python(request.jobs)
+        )
 
-        logger.info(f"[Batch Save] Saved {len(saved_jobs)} jobs")
+        logger.info("[Batch Save] Saved %d jobs", len(saved_jobs))
         return {
             "success": True,
             "saved_count": len(saved_jobs),
@@ -229,5 +264,5 @@ async def batch_save_jobs(request: BatchSaveJobsRequest):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"[Batch Save] Error: {e}")
+        logger.error("[Batch Save] Error: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
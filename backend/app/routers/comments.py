@@ -3,13 +3,16 @@ routers/comments.py – Comment Mode endpoint.
 
 POST /generate-comment
 Accepts a LinkedIn post text, returns 3 AI-generated comment suggestions.
+
+POST /generate-comments/batch
+Same for several posts, answered by a single LLM call.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
-from ..models import CommentRequest, CommentResponse
-from ..services import generate_comments
+from ..models import BatchCommentRequest, BatchCommentResponse, CommentRequest, CommentResponse
+from ..services import batch_generate_comments, generate_comments
 
 logger = logging.getLogger(__name__)
 
@@ -30,10 +33,14 @@ async def create_comment_suggestions(request: CommentRequest):
             post_text=request.post_text,
             tone=request.tone,
         )
-        return CommentResponse(
+        # Both parts are already validated (the request by FastAPI, each
+        # suggestion by generate_comments), so skip re-validating them here
+        # and serialize the response once.
+        result = CommentResponse.model_construct(
             post_text=request.post_text,
             comments=comments,
         )
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except ValueError as e:
         logger.warning("Comment generation failed: %s", e)
         raise HTTPException(status_code=422, detail=str(e))
@@ -43,3 +50,30 @@ async def create_comment_suggestions(request: CommentRequest):
             status_code=500,
             detail="Failed to generate comments. Please check your API key and try again.",
         )
+
+
+@router.post("/generate-comments/batch", response_model=BatchCommentResponse)
+async def create_batch_comment_suggestions(request: BatchCommentRequest):
+    """
+    Generate comment suggestions for up to 10 posts with one LLM call.
+
+    Results are in request order; a post the model skipped has no comments.
+    """
+    logger.info("Generating comments for %d posts", len(request.posts))
+
+    try:
+        comment_lists = await batch_generate_comments(request.posts, tone=request.tone)
+        result = BatchCommentResponse.model_construct(results=[
+            CommentResponse.model_construct(post_text=post, comments=comments)
+            for post, comments in zip(request.posts, comment_lists)
+        ])
+        return Response(content=result.model_dump_json(), media_type="application/json")
+    except ValueError as e:
+        logger.warning("Batch comment generation failed: %s", e)
+        raise HTTPException(status_code=422, detail=str(e))
+    except Exception as e:
+        logger.error("Unexpected error in batch comment generation: %s", e, exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to generate comments. Please check your API key and try again.",
+        )
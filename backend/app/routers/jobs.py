@@ -7,7 +7,7 @@ personalized note, resume tips, and similar roles.
 """
 
 import logging
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Response
 
 from ..models import JobAnalysisRequest, JobAnalysisResponse
 from ..services import analyze_job
@@ -47,7 +47,10 @@ async def analyze_job_posting(request: JobAnalysisRequest):
             user_skills=user_skills,
             user_experience=user_experience,
         )
-        return result
+        # analyze_job already returns a validated model; serialize it once with
+        # pydantic-core instead of letting FastAPI dump, re-validate and
+        # re-serialize it against response_model (still used for the docs).
+        return Response(content=result.model_dump_json(), media_type="application/json")
     except ValueError as e:
         logger.warning("Job analysis failed: %s", e)
         raise HTTPException(status_code=422, detail=str(e))
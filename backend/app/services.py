@@ -6,12 +6,27 @@ Groq provides a generous free tier (30 requests/minute).
 """
 
 import asyncio
-import json
+import hashlib
 import logging
-from openai import AsyncOpenAI, AuthenticationError
+import random
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from typing import Any, AsyncIterator
+
+import httpx
+import jiter
+import orjson
+from openai import APIStatusError, AsyncOpenAI, AuthenticationError, DefaultAsyncHttpxClient
+from pydantic import TypeAdapter, ValidationError
 
 from .config import get_settings
-from .prompts import build_comment_prompt, build_job_analysis_prompt, build_profile_enhancement_prompt
+from .database import LLM_CACHE_MAX_AGE, get_cached_llm_response, save_cached_llm_response
+from .prompts import (
+    build_comment_prompt, build_comment_batch_prompt, build_job_analysis_prompt, build_profile_enhancement_prompt,
+    build_job_batch_scoring_prompt, build_profile_extract_prompt, build_profile_review_prompt,
+)
 from .models import CommentSuggestion, JobAnalysisResponse, ProfileEnhancementResponse
 
 logger = logging.getLogger(__name__)
@@ -20,17 +35,115 @@ logger = logging.getLogger(__name__)
 
 LLM_MAX_RETRIES = 3
 LLM_RETRY_BASE_DELAY = 1.0  # seconds; doubles each retry
-
-
+LLM_RETRY_JITTER = 0.25  # seconds; random extra so concurrent retries spread out
+
+# Exact-match cache for LLM batch scores: the extension rescans the same job
+# cards on every search page, so identical (job, profile) pairs recur often.
+BATCH_SCORE_CACHE_TTL = 24 * 60 * 60  # seconds
+BATCH_SCORE_CACHE_MAX_ENTRIES = 2048
+
+# LLM batch scoring packs several jobs into one prompt (one round trip and
+# one copy of the instructions/profile per group instead of per job)
+BATCH_SCORE_JOBS_PER_CALL = 5
+BATCH_SCORE_MAX_TOKENS_PER_JOB = 400
+# Groups still unscored after this long get placeholders, so one slow
+# completion can't hold up the whole batch response
+BATCH_SCORE_DEADLINE = 20.0  # seconds
+
+# Exact-match cache for whole LLM responses, opted into per caller with a
+# cache_namespace: resubmitting the same job or profile skips Groq. Comment
+# generation is never cached, since Regenerate must return fresh suggestions.
+# Two tiers:
+# - in memory: LLM_RESPONSE_CACHE_MAX_ENTRIES entries, each for up to
+#   LLM_RESPONSE_CACHE_TTL;
+# - SQLite llm_cache: LLM_CACHE_MAX_ROWS rows for LLM_CACHE_MAX_AGE
+#   (database.py), shared across restarts and workers.
+# An entry reloaded from SQLite stays in memory only for what is left of its
+# LLM_CACHE_MAX_AGE, so no response is served past that age.
+LLM_RESPONSE_CACHE_TTL = 60 * 60  # seconds
+LLM_RESPONSE_CACHE_MAX_ENTRIES = 512
+
+# Groq connection pool: HTTP/2 multiplexes concurrent calls (gathered batch
+# groups, analyze+enhance) over one TLS connection, and idle connections are
+# kept for a minute instead of httpx's 5s so sporadic requests reuse them.
+LLM_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=60)
+LLM_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Batch comment generation asks for every post in one completion
+COMMENT_BATCH_MAX_TOKENS_PER_POST = 600
+
+
+@lru_cache(maxsize=1)
 def _get_client() -> AsyncOpenAI:
-    """Create an AsyncOpenAI client pointed at Groq's API."""
+    """
+    Return the shared AsyncOpenAI client pointed at Groq's API.
+
+    Built once so every call reuses its httpx connection pool (no new TCP/TLS
+    handshake per request); closed by close_client() on shutdown.
+    """
     settings = get_settings()
     return AsyncOpenAI(
         api_key=settings.groq_api_key,
         base_url="https://api.groq.com/openai/v1",
+        # _call_llm runs its own backoff; SDK retries would multiply attempts
+        max_retries=0,
+        http_client=DefaultAsyncHttpxClient(
+            http2=True, limits=LLM_HTTP_LIMITS, timeout=LLM_HTTP_TIMEOUT
+        ),
     )
 
 
+async def close_client() -> None:
+    """Close the shared client's connection pool, if it was ever created."""
+    if _get_client.cache_info().currsize:
+        await _get_client().close()
+        _get_client.cache_clear()
+
+
+class _RateLimiter:
+    """Token bucket allowing `rate` acquisitions per `period` seconds, with bursts up to `rate`."""
+
+    def __init__(self, rate: int, period: float = 60.0):
+        self._rate = rate
+        self._period = period
+        self._tokens = float(rate)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        # Waiters queue on the lock, so tokens are handed out in arrival order
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._rate, self._tokens + (now - self._updated) * self._rate / self._period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self._period / self._rate)
+
+
+@lru_cache(maxsize=1)
+def _llm_semaphore() -> asyncio.Semaphore:
+    return asyncio.Semaphore(get_settings().groq_max_concurrency)
+
+
+@lru_cache(maxsize=1)
+def _llm_rate_limiter() -> _RateLimiter | None:
+    rpm = get_settings().groq_requests_per_minute
+    return _RateLimiter(rpm) if rpm > 0 else None
+
+
+@asynccontextmanager
+async def _llm_slot():
+    """Hold one of the concurrent Groq request slots, after a rate-limit token."""
+    async with _llm_semaphore():
+        limiter = _llm_rate_limiter()
+        if limiter:
+            await limiter.acquire()
+        yield
+
+
 def _sanitize_raw(raw: str, max_length: int = 100) -> str:
     """Sanitize raw LLM response for error messages to avoid PII leakage."""
     if not raw:
@@ -45,23 +158,42 @@ async def _call_llm(
     temperature: float = 0.7,
     max_tokens: int = 1024,
     expected_keys: set[str] | None = None,
+    cache_namespace: str | None = None,
 ) -> dict:
     """
     Send messages to Groq and parse the JSON response.
 
     Includes automatic retry with exponential backoff for transient errors
     (rate limits, timeouts, server errors). Retries up to LLM_MAX_RETRIES
-    times with increasing delays.
+    times with increasing, jittered delays; other 4xx errors fail at once.
 
     Args:
         messages: Chat messages to send.
         temperature: Controls randomness. 0 = deterministic, 1 = creative.
         max_tokens: Maximum tokens in the response.
         expected_keys: Optional set of keys that must be present in the JSON response.
+        cache_namespace: If set, identical requests under this namespace are
+            answered from an in-process cache. Callers must not mutate the
+            returned dict.
 
     Raises ValueError if the response is not valid JSON or missing expected keys.
     """
-    settings = get_settings()
+    model = get_settings().groq_model
+    cache_key = None
+    if cache_namespace:
+        cache_key = _llm_response_cache_key(
+            cache_namespace, model, messages, temperature, max_tokens
+        )
+        cached = _get_cached_response(cache_key)
+        if cached is None:
+            persisted = await _load_persisted_response(cache_key)
+            if persisted is not None:
+                cached, age = persisted
+                _cache_response(cache_key, cached, ttl=min(LLM_RESPONSE_CACHE_TTL, LLM_CACHE_MAX_AGE - age))
+        if cached is not None:
+            logger.info("LLM response cache hit (namespace=%s)", cache_namespace)
+            return cached
+
     client = _get_client()
     last_error: Exception | None = None
 
@@ -69,23 +201,24 @@ async def _call_llm(
         try:
             logger.info(
                 "Calling Groq model=%s (temp=%.1f, max_tokens=%d, attempt=%d/%d)",
-                settings.groq_model, temperature, max_tokens, attempt, LLM_MAX_RETRIES,
+                model, temperature, max_tokens, attempt, LLM_MAX_RETRIES,
             )
 
-            response = await client.chat.completions.create(
-                model=settings.groq_model,
-                messages=messages,
-                temperature=temperature,
-                max_tokens=max_tokens,
-                response_format={"type": "json_object"},
-            )
+            async with _llm_slot():
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=messages,
+                    temperature=temperature,
+                    max_tokens=max_tokens,
+                    response_format={"type": "json_object"},
+                )
 
             raw = response.choices[0].message.content.strip()
             logger.debug("LLM raw response: %s", raw[:200])
 
             try:
-                data = json.loads(raw)
-            except json.JSONDecodeError as e:
+                data = orjson.loads(raw)
+            except orjson.JSONDecodeError as e:
                 logger.error("Failed to parse LLM response as JSON: %s. Raw response: %s", e, raw)
                 raise ValueError(f"AI returned an invalid JSON response. Raw (truncated): {_sanitize_raw(raw)}") from e
 
@@ -93,15 +226,18 @@ async def _call_llm(
                 logger.error("LLM response is not a dict: %s. Raw: %s", type(data), raw)
                 raise ValueError(f"Expected JSON object (dict), got {type(data).__name__}. Raw (redacted): <redacted>")
 
-            if expected_keys:
-                missing_keys = expected_keys - set(data.keys())
-                if missing_keys:
-                    logger.error("LLM response missing keys: %s. Present keys: %s. Raw: %s", missing_keys, list(data.keys()), raw)
-                    raise ValueError(
-                        f"LLM response is missing required keys: {', '.join(sorted(missing_keys))}. "
-                        f"Expected keys: {', '.join(sorted(expected_keys))}. Raw (truncated): {_sanitize_raw(raw)}"
-                    )
+            # Subset test against the keys view: no set is built unless keys are missing
+            if expected_keys and not expected_keys <= data.keys():
+                missing_keys = expected_keys - data.keys()
+                logger.error("LLM response missing keys: %s. Present keys: %s. Raw: %s", missing_keys, list(data.keys()), raw)
+                raise ValueError(
+                    f"LLM response is missing required keys: {', '.join(sorted(missing_keys))}. "
+                    f"Expected keys: {', '.join(sorted(expected_keys))}. Raw (truncated): {_sanitize_raw(raw)}"
+                )
 
+            if cache_key:
+                _cache_response(cache_key, data)
+                await _persist_response(cache_key, data)
             return data
 
         except (ValueError, AuthenticationError):
@@ -109,9 +245,12 @@ async def _call_llm(
             # Neither will succeed on retry, so fail immediately
             raise
         except Exception as e:
+            if isinstance(e, APIStatusError) and not _is_retryable_status(e.status_code):
+                # Other 4xx (bad request, permissions, unknown model) won't change on retry
+                raise
             last_error = e
             if attempt < LLM_MAX_RETRIES:
-                delay = LLM_RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                delay = LLM_RETRY_BASE_DELAY * (2 ** (attempt - 1)) + random.uniform(0, LLM_RETRY_JITTER)
                 logger.warning(
                     "LLM call failed (attempt %d/%d): %s. Retrying in %.1fs…",
                     attempt, LLM_MAX_RETRIES, e, delay,
@@ -123,6 +262,95 @@ async def _call_llm(
     raise last_error or RuntimeError("LLM call failed after all retries")
 
 
+def _is_retryable_status(status_code: int) -> bool:
+    """Rate limits, timeouts, conflicts and server errors are worth retrying."""
+    return status_code in (408, 409, 429) or status_code >= 500
+
+
+async def _call_llm_stream(
+    messages: list[dict],
+    temperature: float = 0.7,
+    max_tokens: int = 1024,
+) -> AsyncIterator[str]:
+    """
+    Send messages to Groq with stream=True and yield the text deltas.
+
+    The caller accumulates and parses the JSON. There is no retry or
+    caching, since output may already have been forwarded to the client.
+    """
+    model = get_settings().groq_model
+    logger.info(
+        "Streaming Groq model=%s (temp=%.1f, max_tokens=%d)",
+        model, temperature, max_tokens,
+    )
+    # The slot covers starting the request; the stream itself is drained at
+    # the client's pace and shouldn't block other calls.
+    async with _llm_slot():
+        stream = await _get_client().chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            max_tokens=max_tokens,
+            response_format={"type": "json_object"},
+            stream=True,
+        )
+    async for chunk in stream:
+        if chunk.choices and chunk.choices[0].delta.content:
+            yield chunk.choices[0].delta.content
+
+
+# ─── LLM Response Cache ───────────────────────────────────────────────────────
+
+_llm_response_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def _llm_response_cache_key(
+    namespace: str, model: str, messages: list[dict], temperature: float, max_tokens: int
+) -> str:
+    """Hash everything that determines the completion request."""
+    return hashlib.sha256(
+        orjson.dumps([namespace, model, temperature, max_tokens, messages])
+    ).hexdigest()
+
+
+def _get_cached_response(key: str) -> dict | None:
+    """Return a cached LLM response, or None if missing or expired."""
+    entry = _llm_response_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, data = entry
+    if expires_at < time.monotonic():
+        del _llm_response_cache[key]
+        return None
+    _llm_response_cache.move_to_end(key)
+    return data
+
+
+async def _load_persisted_response(key: str) -> tuple[dict, float] | None:
+    """Look a response and its age up in the SQLite cache; a storage error is just a miss."""
+    try:
+        return await get_cached_llm_response(key, LLM_CACHE_MAX_AGE)
+    except Exception as e:
+        logger.warning("LLM cache read failed: %s", e)
+        return None
+
+
+async def _persist_response(key: str, data: dict) -> None:
+    """Write a response to the SQLite cache; failures never fail the LLM call."""
+    try:
+        await save_cached_llm_response(key, data)
+    except Exception as e:
+        logger.warning("LLM cache write failed: %s", e)
+
+
+def _cache_response(key: str, data: dict, ttl: float = LLM_RESPONSE_CACHE_TTL) -> None:
+    """Store a validated LLM response, evicting the least recently used past the limit."""
+    _llm_response_cache[key] = (time.monotonic() + ttl, data)
+    _llm_response_cache.move_to_end(key)
+    while len(_llm_response_cache) > LLM_RESPONSE_CACHE_MAX_ENTRIES:
+        _llm_response_cache.popitem(last=False)
+
+
 async def generate_comments(post_text: str, tone: str | None = None) -> list[CommentSuggestion]:
     """
     Generate 3 LinkedIn comment suggestions for a given post.
@@ -136,7 +364,60 @@ async def generate_comments(post_text: str, tone: str | None = None) -> list[Com
         # Fallback if the list is empty despite key presence
         raise ValueError("AI did not return any comments.")
 
-    return [CommentSuggestion(**c) for c in comments[:5]]
+    suggestions = _to_comment_suggestions(comments)
+    if not suggestions:
+        raise ValueError("AI did not return any valid comments.")
+    return suggestions
+
+
+async def batch_generate_comments(posts: list[str], tone: str | None = None) -> list[list[CommentSuggestion]]:
+    """
+    Generate 5 comment suggestions for each of several posts in one LLM call.
+
+    Returns one list per post, in input order. A post the LLM left out of
+    its response gets an empty list rather than failing the whole batch.
+    """
+    messages = build_comment_batch_prompt(posts, tone)
+    data = await _call_llm(
+        messages,
+        max_tokens=COMMENT_BATCH_MAX_TOKENS_PER_POST * len(posts),
+        expected_keys={"results"},
+    )
+
+    by_id: dict[int, list] = {}
+    for item in data.get("results") or []:
+        if not isinstance(item, dict) or not isinstance(item.get("id"), int):
+            continue
+        if isinstance(item.get("comments"), list):
+            by_id[item["id"]] = item["comments"]
+
+    missing = [i for i in range(len(posts)) if not by_id.get(i)]
+    if missing:
+        logger.warning("[Batch Comments] No comments returned for posts %s", missing)
+    return [_to_comment_suggestions(by_id.get(i, [])) for i in range(len(posts))]
+
+
+def _to_comment_suggestions(comments: Any) -> list[CommentSuggestion]:
+    """Validate up to 5 raw LLM comments, dropping any that don't fit CommentSuggestion."""
+    if not isinstance(comments, list):
+        logger.warning("Expected a list of comments, got %s", type(comments).__name__)
+        return []
+
+    suggestions = []
+    for c in comments:
+        if len(suggestions) == 5:
+            break
+        if not isinstance(c, dict):
+            logger.warning("Dropping invalid comment suggestion %r", c)
+            continue
+        try:
+            # Normalize the style label so "Authority " still matches CommentStyle
+            suggestions.append(
+                CommentSuggestion.model_validate({**c, "style": str(c.get("style", "")).strip().lower()})
+            )
+        except ValidationError as e:
+            logger.warning("Dropping invalid comment suggestion %r: %s", c, e)
+    return suggestions
 
 
 async def analyze_job(
@@ -150,49 +431,18 @@ async def analyze_job(
     messages = build_job_analysis_prompt(job_text, user_skills, user_experience)
     # The JobAnalysisResponse model expects these keys matching the prompt
     expected_keys = {"matched_skills", "missing_skills", "match_percentage", "personalized_note", "resume_tips", "similar_roles"}
-    data = await _call_llm(messages, expected_keys=expected_keys)
+    data = await _call_llm(messages, expected_keys=expected_keys, cache_namespace="job_analysis")
 
-    return JobAnalysisResponse(**data)
+    return JobAnalysisResponse.model_validate(data)
 
 
 async def analyze_profile_text(raw_text: str) -> dict:
     """
     Analyze raw LinkedIn profile text and extract structured profile data.
     """
-    messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a profile analyzer. Extract structured information from LinkedIn profile text. "
-                "Return clean, organized data. Be concise and accurate."
-            ),
-        },
-        {
-            "role": "user",
-            "content": f"""Extract the following from this LinkedIn profile text and return as JSON:
-
-1. **name** – Full name of the person
-2. **skills** – List of technical and professional skills (as an array of strings, max 15)
-3. **experience** – A 1-2 sentence summary of their professional experience (years, roles, industries)
-4. **summary** – A 2-3 sentence professional bio based on their profile
-
-LinkedIn Profile Text:
-\"\"\"
-{raw_text[:2500]}
-\"\"\"
-
-Respond with ONLY valid JSON:
-{{
-  "name": "...",
-  "skills": ["skill1", "skill2", "..."],
-  "experience": "...",
-  "summary": "..."
-}}""",
-        },
-    ]
-
+    messages = build_profile_extract_prompt(raw_text)
     expected_keys = {"name", "skills", "experience", "summary"}
-    data = await _call_llm(messages, expected_keys=expected_keys)
+    data = await _call_llm(messages, expected_keys=expected_keys, cache_namespace="profile_extract")
     return data
 
 
@@ -200,49 +450,32 @@ async def enhance_profile_text(raw_text: str) -> dict:
     """
     Analyze a LinkedIn profile and return enhancement suggestions.
     """
-    messages = [
-        {
-            "role": "system",
-            "content": (
-                "You are a LinkedIn profile optimization expert and personal branding coach. "
-                "You help professionals make their LinkedIn profiles stand out to recruiters, "
-                "clients, and connections. Be specific, actionable, and encouraging."
-            ),
-        },
-        {
-            "role": "user",
-            "content": f"""Analyze this LinkedIn profile and provide specific improvement suggestions.
-
-LinkedIn Profile:
-\"\"\"
-{raw_text[:2500]}
-\"\"\"
-
-Provide a comprehensive profile review with:
-1. **profile_score** – Rate the profile out of 100 based on completeness, clarity, and impact.
-2. **headline_suggestion** – Write a better, more compelling headline (max 120 chars). If it's already great, explain why.
-3. **about_rewrite** – Write an improved About section (3-4 paragraphs) that tells their story, highlights achievements, and includes a call-to-action. Make it sound human, not corporate.
-4. **skills_to_add** – List 5-8 skills they should add to their profile based on their experience.
-5. **tips** – 4-6 specific, actionable tips to improve their overall LinkedIn presence (not just profile text — include activity, engagement, networking advice).
-
-Respond with ONLY valid JSON:
-{{
-  "profile_score": 65,
-  "headline_suggestion": "...",
-  "about_rewrite": "...",
-  "skills_to_add": ["skill1", "skill2"],
-  "tips": ["tip1", "tip2", "tip3", "tip4"]
-}}""",
-        },
-    ]
+    messages = build_profile_review_prompt(raw_text)
 
     # Use max_tokens=4096 for this longer response and validate required keys
     required_keys = {"profile_score", "headline_suggestion", "about_rewrite", "skills_to_add", "tips"}
-    data = await _call_llm(messages, temperature=0, max_tokens=4096, expected_keys=required_keys)
+    data = await _call_llm(
+        messages, temperature=0, max_tokens=4096, expected_keys=required_keys,
+        cache_namespace="profile_review",
+    )
 
     return data
 
 
+async def analyze_and_enhance_profile_text(raw_text: str) -> dict:
+    """
+    Extract structured profile data and review the profile in one go.
+
+    The two LLM calls are independent, so they run concurrently on the
+    shared client instead of back to back.
+    """
+    profile, enhancement = await asyncio.gather(
+        analyze_profile_text(raw_text),
+        enhance_profile_text(raw_text),
+    )
+    return {"profile": profile, "enhancement": enhancement}
+
+
 async def enhance_profile(
     current_headline: str,
     about_section: str,
@@ -301,10 +534,115 @@ async def enhance_profile(
         temperature=0.5,
         max_tokens=8000,
         expected_keys=expected_keys,
+        cache_namespace="profile_enhance",
     )
     
     logger.info("Profile enhancement completed for target role: %s", target_role)
-    return ProfileEnhancementResponse(**data)
+    return ProfileEnhancementResponse.model_validate(data)
+
+
+# Validators for each top-level section of ProfileEnhancementResponse, so a
+# streamed section can be checked on its own as soon as it is complete.
+_PROFILE_SECTION_ADAPTERS = {
+    name: TypeAdapter(field.annotation)
+    for name, field in ProfileEnhancementResponse.model_fields.items()
+}
+
+
+def _validate_profile_section(name: str, value: Any) -> Any:
+    """Validate one profile enhancement section and return it JSON-ready."""
+    adapter = _PROFILE_SECTION_ADAPTERS[name]
+    return adapter.dump_python(adapter.validate_python(value), mode="json")
+
+
+async def stream_profile_enhancement(
+    current_headline: str,
+    about_section: str,
+    experience_descriptions: list[str],
+    current_skills: list[str],
+    target_role: str,
+    years_of_experience: int,
+    featured_section: str | None = None,
+    industry: str | None = None,
+    company_experience: str | None = None,
+) -> AsyncIterator[tuple[str, Any]]:
+    """
+    Stream a profile enhancement section by section.
+
+    Requests the completion with stream=True and scans the chunks as they
+    arrive. A top-level section is complete once the comma after it arrives,
+    so the text up to that comma is parsed with jiter and the section is
+    validated and yielded as (name, value) right away; the last one follows
+    when the stream ends.
+
+    Unlike enhance_profile this does not retry, since sections may already
+    have been sent to the client. Raises ValueError on invalid output.
+    """
+    messages = build_profile_enhancement_prompt(
+        current_headline=current_headline,
+        about_section=about_section,
+        experience_descriptions=experience_descriptions,
+        current_skills=current_skills,
+        featured_section=featured_section,
+        target_role=target_role,
+        years_of_experience=years_of_experience,
+        industry=industry,
+        company_experience=company_experience,
+    )
+
+    buf = bytearray()
+    emitted: set[str] = set()
+    # Track JSON nesting incrementally so the buffer is only parsed when a
+    # top-level comma closes a section, not on every delta.
+    depth = 0
+    in_string = escaped = False
+
+    async for text in _call_llm_stream(messages, temperature=0.5, max_tokens=8000):
+        for i, ch in enumerate(text):
+            if in_string:
+                if escaped:
+                    escaped = False
+                elif ch == "\\":
+                    escaped = True
+                elif ch == '"':
+                    in_string = False
+            elif ch == '"':
+                in_string = True
+            elif ch in "{[":
+                depth += 1
+            elif ch in "}]":
+                depth -= 1
+            elif ch == "," and depth == 1:
+                try:
+                    done = jiter.from_json(bytes(buf) + text[:i].encode() + b"}")
+                except ValueError:
+                    continue
+                if not isinstance(done, dict):
+                    continue
+                for name, value in done.items():
+                    if name in _PROFILE_SECTION_ADAPTERS and name not in emitted:
+                        emitted.add(name)
+                        yield name, _validate_profile_section(name, value)
+        buf += text.encode()
+
+    raw = buf.decode(errors="replace")
+    try:
+        data = jiter.from_json(bytes(buf))
+    except ValueError as e:
+        logger.error("Failed to parse streamed LLM response as JSON: %s. Raw response: %s", e, raw)
+        raise ValueError(f"AI returned an invalid JSON response. Raw (truncated): {_sanitize_raw(raw)}") from e
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected JSON object (dict), got {type(data).__name__}. Raw (redacted): <redacted>")
+
+    missing_keys = _PROFILE_SECTION_ADAPTERS.keys() - data.keys()
+    if missing_keys:
+        raise ValueError(f"LLM response is missing required keys: {', '.join(sorted(missing_keys))}.")
+
+    for name in _PROFILE_SECTION_ADAPTERS:
+        if name not in emitted:
+            yield name, _validate_profile_section(name, data[name])
+
+    logger.info("Streamed profile enhancement completed for target role: %s", target_role)
 
 
 # ─── Batch Job Matching (v2.0) ────────────────────────────────────────────────
@@ -335,44 +673,207 @@ async def match_jobs_batch_service(
     # In normal mode, use LLM-based scoring (slower but more accurate)
     
     if quick_mode:
-        logger.info(f"[Batch Scorer] Quick mode: scoring {len(jobs)} jobs with heuristics")
-        results = []
-        for job in jobs:
-            score = _score_job_heuristic(job, user_profile)
-            results.append(score)
-        return results
+        logger.info("[Batch Scorer] Quick mode: scoring %d jobs with heuristics", len(jobs))
+        profile = _prepare_heuristic_profile(user_profile)
+        return [_score_job_heuristic(job, profile) for job in jobs]
     else:
-        logger.info(f"[Batch Scorer] Normal mode: scoring {len(jobs)} jobs with LLM (parallel)")
-        # Use asyncio.gather to score jobs in parallel to meet the < 5s performance claim
-        import asyncio
-        tasks = [_score_job_llm(job, user_profile) for job in jobs]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        
-        # Filter out exceptions and log them
-        valid_results = []
-        for i, res in enumerate(results):
-            if isinstance(res, Exception):
-                logger.error(f"[Batch Scorer] Error scoring job {jobs[i].get('job_id', 'unknown')}: {res}")
-                # Add a failed result placeholder
-                valid_results.append({
-                    "job_id": jobs[i].get("job_id"),
-                    "match_score": 0,
-                    "ranking_level": "none",
-                    "matched_skills": [],
-                    "missing_skills": [],
-                    "summary": "Error during AI scoring",
-                    "error": str(res)
-                })
+        logger.info("[Batch Scorer] Normal mode: scoring %d jobs with LLM (parallel)", len(jobs))
+        results, keys = _lookup_cached_scores(jobs, user_profile)
+        groups, duplicates = _group_uncached(results, keys)
+
+        # Score the groups in parallel, but only wait BATCH_SCORE_DEADLINE for them
+        tasks = [
+            asyncio.create_task(
+                _score_job_group([jobs[i] for i in group], [keys[i] for i in group], user_profile)
+            )
+            for group in groups
+        ]
+        if tasks:
+            _, pending = await asyncio.wait(tasks, timeout=BATCH_SCORE_DEADLINE)
+            if pending:
+                logger.warning("[Batch Scorer] %d groups missed the %.0fs deadline", len(pending), BATCH_SCORE_DEADLINE)
+                for task in pending:
+                    task.cancel()
+                await asyncio.gather(*pending, return_exceptions=True)
+        for group, task in zip(groups, tasks):
+            if task.cancelled():
+                scored = [_failed_score(jobs[i], "Timed out") for i in group]
+            elif task.exception() is not None:
+                logger.error("[Batch Scorer] Error scoring %d jobs: %s", len(group), task.exception())
+                scored = [_failed_score(jobs[i], task.exception()) for i in group]
             else:
-                valid_results.append(res)
-        return valid_results
+                scored = task.result()
+            for i, result in zip(group, scored):
+                results[i] = result
+                for d in duplicates.get(i, ()):
+                    results[d] = {**result, "job_id": jobs[d].get("job_id")}
+        return results
+
+
+async def iter_jobs_batch_scores(
+    jobs: list[dict],
+    user_profile: dict,
+    quick_mode: bool = False,
+) -> AsyncIterator[dict]:
+    """
+    Like match_jobs_batch_service, but yield each score as soon as it is ready.
+
+    Results arrive in completion order, not input order; use job_id to match
+    them up. Scoring still in flight is cancelled if the consumer stops early.
+    """
+    if quick_mode:
+        profile = _prepare_heuristic_profile(user_profile)
+        for job in jobs:
+            yield _score_job_heuristic(job, profile)
+        return
+
+    results, keys = _lookup_cached_scores(jobs, user_profile)
+    for result in results:
+        if result is not None:
+            yield result
+
+    groups, duplicates = _group_uncached(results, keys)
 
+    async def score_group(group: list[int]) -> tuple[list[int], list[dict]]:
+        try:
+            scored = await _score_job_group([jobs[i] for i in group], [keys[i] for i in group], user_profile)
+        except Exception as e:
+            logger.error("[Batch Scorer] Error scoring %d jobs: %s", len(group), e)
+            scored = [_failed_score(jobs[i], e) for i in group]
+        return group, scored
+
+    tasks = [asyncio.create_task(score_group(group)) for group in groups]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            group, scored = await next_done
+            for i, result in zip(group, scored):
+                yield result
+                for d in duplicates.get(i, ()):
+                    yield {**result, "job_id": jobs[d].get("job_id")}
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+def _lookup_cached_scores(jobs: list[dict], user_profile: dict) -> tuple[list[dict | None], list[str]]:
+    """Return per-job cached scores (None on a miss) and the cache keys."""
+    keys = [_batch_score_cache_key(job, user_profile) for job in jobs]
+    results = []
+    for job, key in zip(jobs, keys):
+        cached = _get_cached_score(key)
+        results.append({**cached, "job_id": job.get("job_id")} if cached is not None else None)
+    return results, keys
+
+
+def _group_uncached(
+    results: list[dict | None], keys: list[str]
+) -> tuple[list[list[int]], dict[int, list[int]]]:
+    """
+    Split the indexes of cache misses into groups of BATCH_SCORE_JOBS_PER_CALL.
 
-def _score_job_heuristic(job: dict, user_profile: dict) -> dict:
+    Misses with the same cache key (a posting listed twice on the page) are
+    scored once: only the first is grouped, and the returned dict maps its
+    index to the indexes of its duplicates.
+    """
+    first_by_key: dict[str, int] = {}
+    duplicates: dict[int, list[int]] = {}
+    misses = []
+    for i, result in enumerate(results):
+        if result is not None:
+            continue
+        first = first_by_key.setdefault(keys[i], i)
+        if first == i:
+            misses.append(i)
+        else:
+            duplicates.setdefault(first, []).append(i)
+    groups = [
+        misses[start:start + BATCH_SCORE_JOBS_PER_CALL]
+        for start in range(0, len(misses), BATCH_SCORE_JOBS_PER_CALL)
+    ]
+    return groups, duplicates
+
+
+async def _score_job_group(jobs: list[dict], keys: list[str], user_profile: dict) -> list[dict]:
+    """Score a group of jobs with one LLM call and cache the successful scores."""
+    scored = await _score_jobs_llm(jobs, user_profile)
+    for key, result in zip(keys, scored):
+        if "error" not in result:
+            _cache_score(key, result)
+    return scored
+
+
+def _failed_score(job: dict, error: Exception | str) -> dict:
+    """Placeholder result for a job the LLM could not score (never cached)."""
+    return {
+        "job_id": job.get("job_id"),
+        "match_score": 0,
+        "ranking_level": "none",
+        "matched_skills": [],
+        "missing_skills": [],
+        "summary": "Error during AI scoring",
+        "error": str(error)
+    }
+
+
+# ─── Batch Score Cache ────────────────────────────────────────────────────────
+
+_batch_score_cache: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+def _batch_score_cache_key(job: dict, user_profile: dict) -> str:
+    """Hash everything the batch-scoring prompt is built from."""
+    return hashlib.sha256(orjson.dumps([
+        job.get("job_title", ""),
+        job.get("company_name", ""),
+        job.get("location", ""),
+        job.get("description", "")[:1500],
+        sorted(user_profile.get("skills", [])),
+        user_profile.get("experience", ""),
+        user_profile.get("target_role", ""),
+    ])).hexdigest()
+
+
+def _get_cached_score(key: str) -> dict | None:
+    """Return a cached score, or None if missing or expired."""
+    entry = _batch_score_cache.get(key)
+    if entry is None:
+        return None
+    expires_at, score = entry
+    if expires_at < time.monotonic():
+        del _batch_score_cache[key]
+        return None
+    _batch_score_cache.move_to_end(key)
+    return score
+
+
+def _cache_score(key: str, score: dict) -> None:
+    """Store a score, evicting the least recently used entries past the limit."""
+    _batch_score_cache[key] = (time.monotonic() + BATCH_SCORE_CACHE_TTL, score)
+    _batch_score_cache.move_to_end(key)
+    while len(_batch_score_cache) > BATCH_SCORE_CACHE_MAX_ENTRIES:
+        _batch_score_cache.popitem(last=False)
+
+
+_SENIORITY_KEYWORDS = ("senior", "lead", "staff", "principal", "junior", "entry")
+
+
+def _prepare_heuristic_profile(user_profile: dict) -> dict:
+    """
+    Lower-case and pre-scan the profile once per batch for _score_job_heuristic.
+    """
+    experience = user_profile.get("experience", "").lower()
+    return {
+        "skills": [s.lower() for s in user_profile.get("skills", [])],
+        "target_role": user_profile.get("target_role", "").lower(),
+        "seniority": [(keyword, keyword in experience) for keyword in _SENIORITY_KEYWORDS],
+    }
+
+
+def _score_job_heuristic(job: dict, profile: dict) -> dict:
     """
     Fast heuristic scoring without LLM calls.
 
-    Scores based on:
+    `profile` comes from _prepare_heuristic_profile. Scores based on:
     - Skill keyword matching (exact match in description)
     - Job title alignment with target role
     - Location preference
@@ -380,20 +881,17 @@ def _score_job_heuristic(job: dict, user_profile: dict) -> dict:
     job_id = job.get("job_id", "unknown")
     job_title = job.get("job_title", "").lower()
     description = job.get("description", "").lower()
-    company = job.get("company_name", "")
-    
-    user_skills = [s.lower() for s in user_profile.get("skills", [])]
-    target_role = user_profile.get("target_role", "").lower()
-    experience = user_profile.get("experience", "").lower()
+    target_role = profile["target_role"]
     
-    # 1. Skill matching (max 50 points)
+    # 1. Skill matching (max 50 points); each skill is searched for once
     matched_skills = []
-    skill_score = 0
-    for skill in user_skills:
+    missing_skills = []
+    for skill in profile["skills"]:
         if skill in description or skill in job_title:
             matched_skills.append(skill)
-            skill_score += 10  # 10 points per matched skill, max 50
-    skill_score = min(skill_score, 50)
+        else:
+            missing_skills.append(skill)
+    skill_score = min(10 * len(matched_skills), 50)  # 10 points per matched skill
     
     # 2. Target role alignment (max 30 points)
     role_score = 0
@@ -403,26 +901,17 @@ def _score_job_heuristic(job: dict, user_profile: dict) -> dict:
         role_score = 15
     
     # 3. Experience level alignment (max 20 points)
-    exp_score = 0
-    years_keywords = ["senior", "lead", "staff", "principal", "junior", "entry"]
-    job_title_lower = job_title.lower()
-    experience_lower = experience.lower()
-    for keyword in years_keywords:
-        keyword_lower = keyword.lower()
-        in_title = keyword_lower in job_title_lower
-        in_experience = keyword_lower in experience_lower
-        if in_title and in_experience:
-            exp_score += 10  # Full points when in both
-        elif in_title or in_experience:
-            exp_score += 5   # Partial points when in only one
+    # 5 points each for the keyword appearing in the title and in the
+    # experience: 10 when in both, 5 when in only one
+    exp_score = sum(
+        5 * ((keyword in job_title) + in_experience)
+        for keyword, in_experience in profile["seniority"]
+    )
     exp_score = min(exp_score, 20)
     
     # Total score
     total_score = skill_score + role_score + exp_score
     
-    # Find missing skills (skills NOT in description AND NOT in job_title)
-    missing_skills = [s for s in user_skills if s not in description and s not in job_title]
-    
     # Ranking logic
     if total_score >= 70:
         ranking = "high"
@@ -441,32 +930,59 @@ def _score_job_heuristic(job: dict, user_profile: dict) -> dict:
     }
 
 
-async def _score_job_llm(job: dict, user_profile: dict) -> dict:
+async def _score_jobs_llm(jobs: list[dict], user_profile: dict) -> list[dict]:
     """
-    LLM-based job scoring for higher accuracy.
+    LLM-based job scoring for higher accuracy, several jobs per call.
 
-    Uses structured prompt to get match %, ranking, and skill analysis.
+    Uses structured prompt to get match %, ranking, and skill analysis for
+    each job. Returns one result per job in input order and never raises:
+    a failed call, or a job missing from the response, gets a placeholder.
     """
-    from .prompts import build_job_batch_scoring_prompt
+    messages = build_job_batch_scoring_prompt(jobs, user_profile)
     
-    messages = build_job_batch_scoring_prompt(job, user_profile)
-    
-    expected_keys = {"match_percentage", "ranking_level", "matched_skills", "missing_skills", "summary"}
+    try:
+        # Lower temperature for consistent scoring
+        data = await _call_llm(
+            messages,
+            temperature=0.3,
+            max_tokens=BATCH_SCORE_MAX_TOKENS_PER_JOB * len(jobs),
+            expected_keys={"results"},
+        )
+    except Exception as e:
+        logger.error("[Batch Scorer] Error scoring %d jobs: %s", len(jobs), e)
+        return [_failed_score(job, e) for job in jobs]
     
-    # Lower temperature for consistent scoring
-    data = await _call_llm(
-        messages,
-        temperature=0.3,
-        max_tokens=500,
-        expected_keys=expected_keys,
-    )
+    by_id = {}
+    if isinstance(data["results"], list):
+        by_id = {
+            item["id"]: item
+            for item in data["results"]
+            if isinstance(item, dict) and isinstance(item.get("id"), int)
+        }
     
-    # Ensure proper types
-    data["job_id"] = job.get("job_id")
-    data["match_score"] = min(100, max(0, data.get("match_percentage", 50)))
-    data["matched_skills"] = data.get("matched_skills", [])[:5]
-    data["missing_skills"] = data.get("missing_skills", [])[:5]
+    expected_keys = {"match_percentage", "ranking_level", "matched_skills", "missing_skills", "summary"}
+    results = []
+    for i, job in enumerate(jobs):
+        item = by_id.get(i)
+        if item is None or not expected_keys <= item.keys():
+            logger.error("[Batch Scorer] Error scoring job %s: missing from LLM response", job.get("job_id", "unknown"))
+            results.append(_failed_score(job, "AI response did not include this job"))
+            continue
+        
+        # Ensure proper types; a malformed item only fails its own job
+        try:
+            item["match_score"] = min(100, max(0, round(float(item["match_percentage"]))))
+            for field in ("matched_skills", "missing_skills"):
+                skills = item[field] or []
+                if not isinstance(skills, list):
+                    raise TypeError(f"{field} is {type(skills).__name__}, expected a list")
+                item[field] = skills[:5]
+        except (TypeError, ValueError, OverflowError) as e:
+            logger.error("[Batch Scorer] Error scoring job %s: %s", job.get("job_id", "unknown"), e)
+            results.append(_failed_score(job, e))
+            continue
+        item.pop("id", None)
+        item["job_id"] = job.get("job_id")
+        results.append(item)
     
-    return data
-
-
+    return results
@@ -4,13 +4,19 @@ tests/conftest.py – Shared pytest fixtures.
 Uses a temporary file-based SQLite database for each test session.
 aiosqlite's :memory: creates a NEW db per connection, so a temp file
 ensures tables persist across the multiple connections used by database.py.
+Tables are created once per session and the connection pool stays open
+across tests; clean_db empties them (and the in-process LLM caches)
+before each test instead.
 """
 
+import json
 import os
 import tempfile
+from types import SimpleNamespace
 import pytest
 import pytest_asyncio
 import asyncio
+import aiosqlite
 
 # Create a temp DB file BEFORE importing any app code
 _tmp = tempfile.NamedTemporaryFile(suffix=".db", delete=False)
@@ -22,8 +28,9 @@ os.environ["GROQ_API_KEY"] = "test_key_not_real"
 os.environ["GROQ_MODEL"] = "llama-3.3-70b-versatile"
 
 from httpx import AsyncClient, ASGITransport
+from app import services
 from app.main import app
-from app.database import init_db
+from app.database import init_db, close_db
 from app.config import get_settings
 
 
@@ -35,13 +42,32 @@ def event_loop():
     loop.close()
 
 
-@pytest_asyncio.fixture(autouse=True)
+@pytest_asyncio.fixture(scope="session", autouse=True)
 async def setup_db():
-    """Initialize the database tables before each test."""
+    """Initialize the database tables once for the whole session."""
     # Clear the settings cache so env vars take effect
     get_settings.cache_clear()
     await init_db()
     yield
+    # Pooled aiosqlite connections run on non-daemon threads; close them so
+    # the test process can exit.
+    await close_db()
+
+
+# Parents last, so job_audit_log rows go before the tracked_jobs they reference
+_TABLES_TO_CLEAR = ("job_audit_log", "tracked_jobs", "user_profile", "llm_cache")
+
+
+@pytest_asyncio.fixture(autouse=True)
+async def clean_db(setup_db):
+    """Empty every table and the in-process LLM caches so each test starts clean."""
+    services._llm_response_cache.clear()
+    services._batch_score_cache.clear()
+    async with aiosqlite.connect(_tmp_db_path) as db:
+        for table in _TABLES_TO_CLEAR:
+            await db.execute(f"DELETE FROM {table}")
+        await db.commit()
+    yield
 
 
 @pytest_asyncio.fixture
@@ -52,6 +78,57 @@ async def client():
         yield c
 
 
+@pytest.fixture
+def enhancement_json() -> str:
+    """A canned, valid profile enhancement completion."""
+    return json.dumps({
+        "headline_optimization": {
+            "current_headline": "Backend Engineer",
+            "optimized_headline": "AI Backend Engineer | Python | LLMs",
+            "why_stronger": "Names the stack",
+        },
+        "about_section_enhancement": {
+            "current_about": "I build backends",
+            "optimized_about": "I build AI backends",
+            "positioning_statement": "AI backend specialist",
+            "structure_explanation": "Hook, expertise, impact, vision",
+        },
+        "experience_improvements": {"overall_feedback": "Add metrics"},
+        "skills_strategy": {"suggested_ordering_strategy": "Lead with LLMs"},
+        "recruiter_optimization": {"suggested_positioning": "Target AI roles"},
+        "differentiation_analysis": {"tone_consistency": "Consistent"},
+        "overall_score": {"score_out_of_10": 7},
+        "executive_summary": "Strong base; sharpen the headline.",
+    })
+
+
+@pytest.fixture
+def fake_llm_client():
+    """
+    Factory for AsyncOpenAI stand-ins that complete with `content`.
+
+    Each completion request is appended to `calls` if given. Requests with
+    stream=True get `content` back in small delta chunks.
+    """
+    def make(content: str, calls: list | None = None) -> SimpleNamespace:
+        async def create(**kwargs):
+            if calls is not None:
+                calls.append(kwargs)
+            if kwargs.get("stream"):
+                async def chunks():
+                    for i in range(0, len(content), 40):
+                        delta = SimpleNamespace(content=content[i:i + 40])
+                        yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+                return chunks()
+            message = SimpleNamespace(content=content)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+        return SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+
+    return make
+
+
 def pytest_sessionfinish(session, exitstatus):
     """Clean up the temp database file after all tests."""
     try:
@@ -5,9 +5,14 @@ Tests the HTTP interface without calling the real LLM —
 validates request validation, profile CRUD, and health check.
 """
 
+import json
+
 import pytest
 from httpx import AsyncClient
 
+from app import services
+from app.models import MAX_INPUT_TEXT_LENGTH
+
 
 @pytest.mark.asyncio
 async def test_health_check(client: AsyncClient):
@@ -54,6 +59,28 @@ async def test_comment_validation_too_short(client: AsyncClient):
     assert resp.status_code == 422  # Pydantic validation error
 
 
+@pytest.mark.asyncio
+async def test_batch_comment_validation(client: AsyncClient):
+    """POST /generate-comments/batch should reject empty, short or oversize batches."""
+    for posts in ([], ["Hi"], ["A long enough post"] * 11):
+        resp = await client.post("/generate-comments/batch", json={"posts": posts})
+        assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_oversized_text_rejected_before_llm(client: AsyncClient):
+    """Text inputs over MAX_INPUT_TEXT_LENGTH should return 422 without an LLM call."""
+    huge = "x" * (MAX_INPUT_TEXT_LENGTH + 1)
+    for path, body in (
+        ("/generate-comment", {"post_text": huge}),
+        ("/analyze-job", {"job_text": huge}),
+        ("/analyze-profile", {"raw_text": huge}),
+        ("/enhance-profile", {"raw_text": huge}),
+    ):
+        resp = await client.post(path, json=body)
+        assert resp.status_code == 422, path
+
+
 @pytest.mark.asyncio
 async def test_job_analysis_validation_too_short(client: AsyncClient):
     """POST /analyze-job with text too short should return 422."""
@@ -75,6 +102,20 @@ async def test_enhance_profile_validation(client: AsyncClient):
     assert resp.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_enhance_profile_advanced_rejects_long_experience(client: AsyncClient):
+    """Experience descriptions over 2000 characters should return 422."""
+    resp = await client.post("/enhance-profile-advanced", json={
+        "current_headline": "Backend Engineer",
+        "about_section": "I build backend systems for a living.",
+        "experience_descriptions": ["Shipped APIs", "x" * 2001],
+        "target_role": "AI Engineer",
+        "years_of_experience": 5,
+    })
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"] == ["body", "experience_descriptions", 1]
+
+
 @pytest.mark.asyncio
 async def test_batch_score_validation_empty(client: AsyncClient):
     """POST /jobs/batch-score-jobs with empty jobs should return 422."""
@@ -85,6 +126,25 @@ async def test_batch_score_validation_empty(client: AsyncClient):
     assert resp.status_code == 422
 
 
+@pytest.mark.asyncio
+async def test_batch_score_stream_quick_mode(client: AsyncClient):
+    """The streaming batch scorer should send one NDJSON line per job."""
+    resp = await client.post("/jobs/batch-score-jobs/stream", json={
+        "jobs": [
+            {"job_id": "s1", "job_title": "Python Developer", "description": "Python and SQL"},
+            {"job_id": "s2", "job_title": "Designer", "description": "Figma"},
+        ],
+        "user_profile": {"skills": ["python"]},
+        "quick_mode": True,
+    })
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    results = [json.loads(line) for line in resp.text.splitlines()]
+    assert {r["job_id"] for r in results} == {"s1", "s2"}
+    assert next(r for r in results if r["job_id"] == "s1")["matched_skills"] == ["python"]
+
+
 @pytest.mark.asyncio
 async def test_track_job_via_api(client: AsyncClient):
     """POST /jobs/track should save a job and return success."""
@@ -107,3 +167,108 @@ async def test_list_jobs_via_api(client: AsyncClient):
     data = resp.json()
     assert "jobs" in data
     assert "total" in data
+    assert "next_cursor" in data
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_invalid_cursor_via_api(client: AsyncClient):
+    """GET /jobs/ with a malformed cursor should return 400."""
+    resp = await client.get("/jobs/", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_invalid_sort_via_api(client: AsyncClient):
+    """GET /jobs/ with an unknown sort field or order should return 422."""
+    resp = await client.get("/jobs/", params={"sortBy": "notes"})
+    assert resp.status_code == 422
+    resp = await client.get("/jobs/", params={"sortOrder": "sideways"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_batch_save_jobs_via_api(client: AsyncClient):
+    """POST /jobs/batch should save all jobs in one request."""
+    resp = await client.post("/jobs/batch", json={
+        "jobs": [
+            {"job_title": "Batch API Job 1", "company_name": "BatchCo"},
+            {"job_title": "Batch API Job 2", "company_name": "BatchCo"},
+        ],
+    })
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["saved_count"] == 2
+    assert all(job["id"] for job in data["jobs"])
+
+
+@pytest.mark.asyncio
+async def test_batch_save_rejects_malformed_json(client: AsyncClient):
+    """Malformed JSON bodies should be rejected with a 422 on the body."""
+    resp = await client.post(
+        "/jobs/batch", content=b'{"jobs": [', headers={"Content-Type": "application/json"}
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["loc"][0] == "body"
+
+
+@pytest.mark.asyncio
+async def test_cors_allows_extension_origin(client: AsyncClient):
+    """Requests from a Chrome extension origin should get CORS headers."""
+    origin = "chrome-extension://" + "a" * 32
+    resp = await client.get("/health", headers={"Origin": origin})
+    assert resp.headers.get("access-control-allow-origin") == origin
+
+
+@pytest.mark.asyncio
+async def test_cors_rejects_unknown_origin(client: AsyncClient):
+    """Requests from an unknown origin should not get CORS headers."""
+    resp = await client.get("/health", headers={"Origin": "https://evil.example"})
+    assert "access-control-allow-origin" not in resp.headers
+
+
+@pytest.mark.asyncio
+async def test_enhance_profile_stream_sends_each_section(
+    client: AsyncClient, monkeypatch, fake_llm_client, enhancement_json
+):
+    """The SSE endpoint should send every section once, then a done event."""
+    monkeypatch.setattr(services, "_get_client", lambda: fake_llm_client(enhancement_json))
+
+    resp = await client.post("/enhance-profile-advanced/stream", json={
+        "current_headline": "Backend Engineer",
+        "about_section": "I build backend systems for a living.",
+        "target_role": "AI Engineer",
+        "years_of_experience": 5,
+    })
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/event-stream")
+
+    events = [block.split("\n") for block in resp.text.strip().split("\n\n")]
+    sections = [json.loads(data[6:]) for event, data in events if event == "event: section"]
+    assert [s["section"] for s in sections] == list(json.loads(enhancement_json))
+    assert sections[-1]["data"] == "Strong base; sharpen the headline."
+    assert events[-1][0] == "event: done"
+
+
+@pytest.mark.asyncio
+async def test_enhance_profile_stream_reports_invalid_output(
+    client: AsyncClient, monkeypatch, fake_llm_client, enhancement_json
+):
+    """Truncated LLM output should end the stream with an error event."""
+    monkeypatch.setattr(services, "_get_client", lambda: fake_llm_client(enhancement_json[:200]))
+
+    resp = await client.post("/enhance-profile-advanced/stream", json={
+        "current_headline": "Backend Engineer",
+        "about_section": "I build backend systems for a living.",
+        "target_role": "AI Engineer",
+        "years_of_experience": 5,
+    })
+    assert resp.text.strip().split("\n\n")[-1].startswith("event: error")
+
+
+
+@pytest.mark.asyncio
+async def test_missing_job_returns_404_via_api(client: AsyncClient):
+    """GET/PUT/DELETE /jobs/{id} for an unknown id should return 404."""
+    assert (await client.get("/jobs/does-not-exist")).status_code == 404
+    assert (await client.put("/jobs/does-not-exist", json={"status": "applied"})).status_code == 404
+    assert (await client.delete("/jobs/does-not-exist")).status_code == 404
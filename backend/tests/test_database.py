@@ -4,12 +4,18 @@ tests/test_database.py – Tests for database CRUD operations.
 
 import pytest
 import json
+import sqlite3
+import time
 
+from app import database
 from app.database import (
+    _build_list_sql,
+    _get_db_path,
     init_db,
     get_user_profile,
     save_user_profile,
     save_tracked_job,
+    save_tracked_jobs_bulk,
     get_tracked_job,
     list_tracked_jobs,
     update_tracked_job,
@@ -60,7 +66,7 @@ async def test_update_existing_profile():
         experience="3 years",
         summary="Original summary",
     )
-    await save_user_profile(profile)
+    original = await save_user_profile(profile)
 
     updated = UserProfile(
         name="Updated Name",
@@ -71,6 +77,10 @@ async def test_update_existing_profile():
     result = await save_user_profile(updated)
     assert result.name == "Updated Name"
     assert "Go" in result.skills
+    assert result.id == original.id
+
+    retrieved = await get_user_profile()
+    assert retrieved.name == "Updated Name"
 
 
 # ─── Job Tracking Tests ──────────────────────────────────────────────────────
@@ -110,6 +120,35 @@ async def test_save_job_requires_title_and_company():
         await save_tracked_job({"job_title": "", "company_name": ""})
 
 
+@pytest.mark.asyncio
+async def test_save_jobs_bulk():
+    """Bulk save should persist every job and return them with IDs."""
+    saved = await save_tracked_jobs_bulk([
+        {"job_title": "Bulk Job 1", "company_name": "BulkCo", "matched_skills": ["Go"]},
+        {"job_title": "Bulk Job 2", "company_name": "BulkCo"},
+    ])
+    assert len(saved) == 2
+    assert saved[0]["id"] != saved[1]["id"]
+
+    retrieved = await get_tracked_job(saved[0]["id"])
+    assert retrieved is not None
+    assert retrieved["job_title"] == "Bulk Job 1"
+    assert retrieved["matched_skills"] == ["Go"]
+
+
+@pytest.mark.asyncio
+async def test_save_jobs_bulk_rejects_whole_batch():
+    """An invalid job should abort the bulk save before anything is written."""
+    with pytest.raises(ValueError, match="required"):
+        await save_tracked_jobs_bulk([
+            {"job_title": "Never Saved", "company_name": "GhostCo"},
+            {"job_title": "", "company_name": ""},
+        ])
+
+    result = await list_tracked_jobs(search="Never Saved")
+    assert result["total"] == 0
+
+
 @pytest.mark.asyncio
 async def test_update_job():
     """Updating a job should change only allowed fields."""
@@ -125,6 +164,13 @@ async def test_update_job():
     assert updated["notes"] == "Sent resume"
 
 
+@pytest.mark.asyncio
+async def test_update_nonexistent_job():
+    """Updating a non-existent job should return None."""
+    result = await update_tracked_job("nonexistent-id", {"status": "applied"})
+    assert result is None
+
+
 @pytest.mark.asyncio
 async def test_delete_job():
     """Deleting a job should remove it from the database."""
@@ -160,6 +206,146 @@ async def test_list_jobs_with_pagination():
     assert len(result["jobs"]) <= 2
     assert result["total"] >= 5
 
+    # A page past the end still reports the total
+    beyond = await list_tracked_jobs(page=10_000, pageSize=2)
+    assert beyond["jobs"] == []
+    assert beyond["total"] == result["total"]
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_cursor_pagination():
+    """Following next_cursor should visit every job exactly once, in order."""
+    await save_tracked_jobs_bulk([
+        {"job_title": f"Cursor Job {i}", "company_name": "CursorCo", "match_percentage": i * 10}
+        for i in range(5)
+    ])
+
+    expected = await list_tracked_jobs(page=1, pageSize=100, sortBy="match_percentage")
+    first = await list_tracked_jobs(page=1, pageSize=2, sortBy="match_percentage")
+    seen = [job["id"] for job in first["jobs"]]
+    cursor = first["next_cursor"]
+    while cursor:
+        result = await list_tracked_jobs(pageSize=2, sortBy="match_percentage", cursor=cursor)
+        assert result["total"] is None
+        seen.extend(job["id"] for job in result["jobs"])
+        cursor = result["next_cursor"]
+
+    assert seen == [job["id"] for job in expected["jobs"]]
+
+
+def test_cursor_page_reads_in_index_order():
+    """Keyset pages should seek the (sort column, id) index with no sort step."""
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        for sort_by in ("created_at", "match_percentage"):
+            sql = _build_list_sql("cursor", sort_by, "desc", False, False, False, False)
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("", "", 10)))
+            assert "TEMP B-TREE" not in plan
+        # A ranking filter seeks the (ranking_level, match_percentage, id) index
+        sql = _build_list_sql("cursor", "match_percentage", "desc", False, False, True, False)
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("", "", "high", 10)))
+        assert "TEMP B-TREE" not in plan
+    finally:
+        conn.close()
+
+
+def test_offset_page_reads_in_index_order():
+    """Offset pages and their count should stay on the indexes, with no sort step."""
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        for sort_by in ("created_at", "match_percentage"):
+            sql = _build_list_sql("page", sort_by, "desc", False, False, False, False)
+            plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", (10, 0)))
+            assert "TEMP B-TREE" not in plan
+        sql = _build_list_sql("page", "match_percentage", "desc", False, False, True, False)
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("high", 10, 0)))
+        assert "TEMP B-TREE" not in plan
+
+        sql = _build_list_sql("count", "created_at", "desc", False, False, False, False)
+        plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+        assert "COVERING INDEX" in plan
+    finally:
+        conn.close()
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_invalid_cursor():
+    """A malformed cursor should raise ValueError."""
+    with pytest.raises(ValueError, match="cursor"):
+        await list_tracked_jobs(cursor="not-a-cursor")
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_cursor_rejects_other_sort():
+    """A cursor replayed with a different sort should raise instead of returning a wrong page."""
+    await save_tracked_jobs_bulk([
+        {"job_title": f"Sort Job {i}", "company_name": "SortCo", "match_percentage": i}
+        for i in range(3)
+    ])
+    first = await list_tracked_jobs(pageSize=1, sortBy="match_percentage")
+
+    with pytest.raises(ValueError, match="cursor"):
+        await list_tracked_jobs(pageSize=1, sortBy="created_at", cursor=first["next_cursor"])
+    with pytest.raises(ValueError, match="cursor"):
+        await list_tracked_jobs(
+            pageSize=1, sortBy="match_percentage", sortOrder="asc", cursor=first["next_cursor"]
+        )
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_status_filter():
+    """Filtering by several statuses should return only those statuses."""
+    await save_tracked_jobs_bulk([
+        {"job_title": "Filter Job", "company_name": "FilterCo", "status": status}
+        for status in ["new", "applied", "rejected"]
+    ])
+
+    result = await list_tracked_jobs(
+        pageSize=100, filters={"status": ["applied", "rejected"]}, search="FilterCo"
+    )
+    assert sorted(job["status"] for job in result["jobs"]) == ["applied", "rejected"]
+    assert result["total"] == 2
+
+
+@pytest.mark.asyncio
+async def test_list_jobs_full_text_search():
+    """Search should match word prefixes in title, company and description."""
+    saved = await save_tracked_job({
+        "job_title": "Quantum Compiler Engineer",
+        "company_name": "Qubitworks",
+        "description": "Work on photonic hardware toolchains",
+    })
+
+    for term in ["quantum", "Qubit", "photon", "compiler engin"]:
+        result = await list_tracked_jobs(search=term)
+        assert saved["id"] in [job["id"] for job in result["jobs"]], term
+
+    # FTS operators and quotes in user input are treated as plain text
+    result = await list_tracked_jobs(search='quantum" OR "*')
+    assert result["total"] == 0
+
+    await delete_tracked_job(saved["id"])
+    result = await list_tracked_jobs(search="Qubitworks")
+    assert result["total"] == 0
+
+
+@pytest.mark.asyncio
+async def test_init_db_rebuilds_out_of_sync_search_index():
+    """If tracked_jobs rowids are renumbered (as VACUUM may do), init_db should rebuild the index."""
+    saved = await save_tracked_job({"job_title": "Lighthouse Keeper", "company_name": "Beaconly"})
+
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        conn.execute("UPDATE tracked_jobs SET rowid = rowid + 1000 WHERE id = ?", (saved["id"],))
+        conn.commit()
+    finally:
+        conn.close()
+    assert (await list_tracked_jobs(search="Lighthouse"))["total"] == 0
+
+    await init_db()
+    result = await list_tracked_jobs(search="Lighthouse")
+    assert [job["id"] for job in result["jobs"]] == [saved["id"]]
+
 
 @pytest.mark.asyncio
 async def test_get_job_stats():
@@ -169,3 +355,74 @@ async def test_get_job_stats():
     assert "average_match_percentage" in stats
     assert "by_status" in stats
     assert "funnel" in stats
+
+
+@pytest.mark.asyncio
+async def test_job_stats_counts_new_jobs():
+    """Stats should reflect newly saved jobs in every breakdown."""
+    before = await get_job_stats()
+    await save_tracked_job({
+        "job_title": "Stats Job A",
+        "company_name": "StatsCo",
+        "status": "applied",
+        "ranking_level": "high",
+        "match_percentage": 80,
+    })
+    await save_tracked_job({
+        "job_title": "Stats Job B",
+        "company_name": "StatsCo",
+        "status": "applied",
+        "ranking_level": "medium",
+        "match_percentage": 60,
+    })
+
+    after = await get_job_stats()
+    assert after["total_jobs"] == before["total_jobs"] + 2
+    assert after["by_status"]["applied"] == before["by_status"].get("applied", 0) + 2
+    assert after["by_ranking"]["high"] == before["by_ranking"].get("high", 0) + 1
+    assert after["funnel"]["applied"] == before["funnel"]["applied"] + 2
+    assert 0 <= after["average_match_percentage"] <= 100
+
+
+@pytest.mark.asyncio
+async def test_job_stats_top_missing_skills():
+    """Stats should rank skills by how many jobs list them as missing."""
+    await save_tracked_jobs_bulk([
+        {"job_title": f"Gap Job {i}", "company_name": "GapCo", "missing_skills": ["Zig", "Erlang"][: i + 1]}
+        for i in range(2)
+    ])
+
+    stats = await get_job_stats()
+    counts = {item["skill"]: item["count"] for item in stats["top_missing_skills"]}
+    assert counts["Zig"] >= 2
+    assert counts["Zig"] > counts.get("Erlang", 0)
+
+
+# ─── LLM Cache Tests ─────────────────────────────────────────────────────────
+
+
+@pytest.mark.asyncio
+async def test_llm_cache_write_prunes_expired_and_excess_rows(monkeypatch):
+    """Saving a response should drop expired rows and keep only the newest LLM_CACHE_MAX_ROWS."""
+    monkeypatch.setattr(database, "LLM_CACHE_MAX_ROWS", 2)
+    now = time.time()
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        conn.executemany(
+            "INSERT INTO llm_cache (key, response, created_at) VALUES (?, '{}', ?)",
+            [("expired", now - database.LLM_CACHE_MAX_AGE - 60), ("older", now - 20), ("newer", now - 10)],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    await database.save_cached_llm_response("latest", {"ok": True})
+
+    conn = sqlite3.connect(_get_db_path())
+    try:
+        keys = {row[0] for row in conn.execute("SELECT key FROM llm_cache")}
+    finally:
+        conn.close()
+    assert keys == {"newer", "latest"}
+    response, age = await database.get_cached_llm_response("latest", database.LLM_CACHE_MAX_AGE)
+    assert response == {"ok": True} and 0 <= age < 60
@@ -0,0 +1,400 @@
+"""
+tests/test_services.py – Tests for service-layer logic that runs without the LLM.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+import openai
+import pytest
+
+from app import services
+
+
+def _score(job: dict) -> dict:
+    return {"job_id": job["job_id"], "match_score": 80, "ranking_level": "high",
+            "matched_skills": ["python"], "missing_skills": [], "summary": "Good fit"}
+
+
+@pytest.mark.asyncio
+async def test_batch_scores_are_cached(monkeypatch):
+    """A repeated (job, profile) pair should be scored by the LLM only once."""
+    calls = []
+
+    async def fake_score(jobs, user_profile):
+        calls.extend(job["job_id"] for job in jobs)
+        return [_score(job) for job in jobs]
+
+    monkeypatch.setattr(services, "_score_jobs_llm", fake_score)
+    profile = {"skills": ["python"], "experience": "5 years", "target_role": "Backend Engineer"}
+    job = {"job_title": "Backend Engineer", "company_name": "Acme", "description": "Python APIs"}
+
+    first = await services.match_jobs_batch_service([{**job, "job_id": "a"}], profile)
+    second = await services.match_jobs_batch_service(
+        [{**job, "job_id": "b"}, {**job, "job_id": "c", "company_name": "Other"}], profile
+    )
+
+    assert calls == ["a", "c"]
+    assert first[0]["job_id"] == "a"
+    assert [r["job_id"] for r in second] == ["b", "c"]
+    assert second[0]["match_score"] == 80
+
+
+@pytest.mark.asyncio
+async def test_batch_score_failures_are_not_cached(monkeypatch):
+    """Failed LLM scores should return a placeholder and be retried next time."""
+
+    async def failing_call(*args, **kwargs):
+        raise RuntimeError("rate limited")
+
+    monkeypatch.setattr(services, "_call_llm", failing_call)
+    job = {"job_id": "x", "job_title": "Engineer", "description": "Go"}
+
+    result = await services.match_jobs_batch_service([job], {})
+    assert result[0]["ranking_level"] == "none"
+    assert services._batch_score_cache == {}
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_groups_jobs_per_llm_call(monkeypatch):
+    """Jobs should be scored several per call and matched back by id."""
+    monkeypatch.setattr(services, "BATCH_SCORE_JOBS_PER_CALL", 2)
+    call_sizes = []
+
+    async def fake_call(messages, **kwargs):
+        count = messages[1]["content"].count("[id ")
+        call_sizes.append(count)
+        # Answer out of order and leave out id 1 of the first group
+        ids = [i for i in reversed(range(count)) if not (count == 2 and i == 1)]
+        return {"results": [
+            {"id": i, "match_percentage": 120, "ranking_level": "high",
+             "matched_skills": ["a"] * 7, "missing_skills": [], "summary": "ok"}
+            for i in ids
+        ]}
+
+    monkeypatch.setattr(services, "_call_llm", fake_call)
+    jobs = [{"job_id": f"j{i}", "job_title": f"Job {i}"} for i in range(3)]
+
+    results = await services.match_jobs_batch_service(jobs, {"skills": ["a"]})
+
+    assert call_sizes == [2, 1]
+    assert [r["job_id"] for r in results] == ["j0", "j1", "j2"]
+    assert results[0]["match_score"] == 100
+    assert len(results[0]["matched_skills"]) == 5
+    assert "id" not in results[0]
+    assert results[1]["ranking_level"] == "none"
+    assert results[2]["ranking_level"] == "high"
+
+
+@pytest.mark.asyncio
+async def test_iter_batch_scores_yields_in_completion_order(monkeypatch):
+    """Streaming scores should come back as soon as each group finishes."""
+    monkeypatch.setattr(services, "BATCH_SCORE_JOBS_PER_CALL", 1)
+    delays = {"slow": 0.05, "fast": 0}
+
+    async def fake_score(jobs, user_profile):
+        await asyncio.sleep(delays[jobs[0]["job_id"]])
+        return [{"job_id": jobs[0]["job_id"], "match_score": 50}]
+
+    monkeypatch.setattr(services, "_score_jobs_llm", fake_score)
+    jobs = [{"job_id": "slow", "job_title": "A"}, {"job_id": "fast", "job_title": "B"}]
+
+    order = [r["job_id"] async for r in services.iter_jobs_batch_scores(jobs, {})]
+    assert order == ["fast", "slow"]
+
+
+@pytest.mark.asyncio
+async def test_llm_responses_are_cached_per_namespace(monkeypatch, fake_llm_client):
+    """Identical requests in a cache namespace should only reach the API once."""
+    calls = []
+    monkeypatch.setattr(services, "_get_client", lambda: fake_llm_client('{"ok": true}', calls))
+    messages = [{"role": "user", "content": "hello"}]
+
+    first = await services._call_llm(messages, cache_namespace="test")
+    second = await services._call_llm(messages, cache_namespace="test")
+    await services._call_llm(messages, cache_namespace="other")
+    await services._call_llm(messages)
+
+    assert first == second == {"ok": True}
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_llm_responses_survive_a_memory_cache_reset(monkeypatch, fake_llm_client):
+    """Namespaced responses should also be served from the SQLite llm_cache table."""
+    calls = []
+    monkeypatch.setattr(services, "_get_client", lambda: fake_llm_client('{"persisted": 1}', calls))
+    messages = [{"role": "user", "content": "persist me"}]
+
+    await services._call_llm(messages, cache_namespace="test")
+    services._llm_response_cache.clear()  # as after a restart
+    assert await services._call_llm(messages, cache_namespace="test") == {"persisted": 1}
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_reloaded_llm_responses_keep_their_sqlite_expiry(monkeypatch):
+    """A response reloaded from SQLite should stay in memory only for the rest of its max age."""
+    async def fake_load(key):
+        return {"old": True}, services.LLM_CACHE_MAX_AGE - 5
+
+    monkeypatch.setattr(services, "_load_persisted_response", fake_load)
+
+    assert await services._call_llm([{"role": "user", "content": "hi"}], cache_namespace="test") == {"old": True}
+    (expires_at, _), = services._llm_response_cache.values()
+    assert expires_at - time.monotonic() <= 5
+
+
+@pytest.mark.asyncio
+async def test_call_llm_rejects_invalid_json(monkeypatch, fake_llm_client):
+    """A non-JSON completion should raise ValueError without retrying."""
+    calls = []
+    monkeypatch.setattr(services, "_get_client", lambda: fake_llm_client("not json", calls))
+
+    with pytest.raises(ValueError, match="invalid JSON"):
+        await services._call_llm([{"role": "user", "content": "hi"}])
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_analyze_and_enhance_runs_concurrently(monkeypatch):
+    """Profile extraction and review should overlap rather than run in sequence."""
+    running = []
+
+    async def fake_step(name):
+        running.append(name)
+        await asyncio.sleep(0)
+        assert len(running) == 2  # both started before either finished
+        return {"step": name}
+
+    monkeypatch.setattr(services, "analyze_profile_text", lambda text: fake_step("extract"))
+    monkeypatch.setattr(services, "enhance_profile_text", lambda text: fake_step("review"))
+
+    result = await services.analyze_and_enhance_profile_text("profile text")
+    assert result == {"profile": {"step": "extract"}, "enhancement": {"step": "review"}}
+
+
+@pytest.mark.asyncio
+async def test_batch_generate_comments_maps_results_by_id(monkeypatch):
+    """Batch comments should come back in post order, empty for skipped posts."""
+    calls = []
+
+    async def fake_call(messages, **kwargs):
+        calls.append(messages)
+        return {"results": [
+            {"id": 2, "comments": [{"style": "Question ", "comment": "how?"}]},
+            {"id": 0, "comments": [{"style": "authority", "comment": "been there"}]},
+        ]}
+
+    monkeypatch.setattr(services, "_call_llm", fake_call)
+
+    results = await services.batch_generate_comments(["post a", "post b", "post c"])
+
+    assert len(calls) == 1
+    assert [[c.comment for c in r] for r in results] == [["been there"], [], ["how?"]]
+    assert results[2][0].style == "question"
+
+
+@pytest.mark.asyncio
+async def test_batch_generate_comments_drops_invalid_styles(monkeypatch):
+    """Malformed comments are dropped without failing their post or the batch."""
+    async def fake_call(messages, **kwargs):
+        return {"results": [
+            {"id": 0, "comments": [
+                {"style": "sarcastic", "comment": "sure"},
+                "just a string",
+                None,
+                {"style": "project", "comment": "we built one"},
+            ]},
+            {"id": 1, "comments": [{"style": "question", "comment": "why?"}]},
+            {"id": 2, "comments": "not a list"},
+        ]}
+
+    monkeypatch.setattr(services, "_call_llm", fake_call)
+
+    results = await services.batch_generate_comments(["post a", "post b", "post c"])
+
+    assert [[c.comment for c in r] for r in results] == [["we built one"], ["why?"], []]
+
+
+def test_profile_text_prompt_collapses_whitespace():
+    """Pasted profile text should be compacted before the 2500-char cut."""
+    from app.prompts import PROFILE_TEXT_MAX_CHARS, build_profile_extract_prompt
+
+    raw = "  Jane   Doe \n\n\n\n   Staff\tEngineer  \n Python" + " " * 5000 + "tail"
+    content = build_profile_extract_prompt(raw)[1]["content"]
+
+    assert 'Jane Doe\n\nStaff Engineer\nPython tail\n"""' in content
+    long_content = build_profile_extract_prompt("word " * 1000)[1]["content"]
+    assert long_content.count("word") == PROFILE_TEXT_MAX_CHARS // 5
+
+
+def _status_error(cls, status_code: int) -> Exception:
+    request = httpx.Request("POST", "https://api.groq.com/openai/v1/chat/completions")
+    return cls("error", response=httpx.Response(status_code, request=request), body=None)
+
+
+@pytest.mark.asyncio
+async def test_call_llm_retries_rate_limits_only(monkeypatch, fake_llm_client):
+    """429s should be retried with backoff; other 4xx errors should fail at once."""
+    monkeypatch.setattr(services, "LLM_RETRY_BASE_DELAY", 0)
+    monkeypatch.setattr(services, "LLM_RETRY_JITTER", 0)
+    errors = [_status_error(openai.RateLimitError, 429)]
+    calls = []
+    client = fake_llm_client('{"ok": true}', calls)
+    succeed = client.chat.completions.create
+
+    async def create(**kwargs):
+        if errors:
+            calls.append(kwargs)
+            raise errors.pop()
+        return await succeed(**kwargs)
+
+    client.chat.completions.create = create
+    monkeypatch.setattr(services, "_get_client", lambda: client)
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert await services._call_llm(messages) == {"ok": True}
+    assert len(calls) == 2
+
+    errors.append(_status_error(openai.BadRequestError, 400))
+    with pytest.raises(openai.BadRequestError):
+        await services._call_llm(messages)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_allows_burst_then_waits():
+    """The token bucket should pass a full burst at once, then pace the next call."""
+    limiter = services._RateLimiter(2, period=0.2)
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    await limiter.acquire()
+    await limiter.acquire()
+    assert loop.time() - start < 0.05
+
+    await limiter.acquire()
+    assert loop.time() - start >= 0.09
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_deadline_returns_placeholders(monkeypatch):
+    """Groups that miss the deadline should get uncached placeholders, not block."""
+    monkeypatch.setattr(services, "BATCH_SCORE_JOBS_PER_CALL", 1)
+    monkeypatch.setattr(services, "BATCH_SCORE_DEADLINE", 0.05)
+
+    async def fake_score(jobs, user_profile):
+        if jobs[0]["job_id"] == "slow":
+            await asyncio.sleep(10)
+        return [_score(job) for job in jobs]
+
+    monkeypatch.setattr(services, "_score_jobs_llm", fake_score)
+    jobs = [{"job_id": "slow", "job_title": "A"}, {"job_id": "fast", "job_title": "B"}]
+
+    results = await services.match_jobs_batch_service(jobs, {})
+
+    assert [r["job_id"] for r in results] == ["slow", "fast"]
+    assert results[0]["ranking_level"] == "none"
+    assert results[1]["match_score"] == 80
+    assert len(services._batch_score_cache) == 1
+
+
+@pytest.mark.asyncio
+async def test_duplicate_jobs_in_a_batch_are_scored_once(monkeypatch):
+    """A posting listed twice should cost one LLM slot and answer for both ids."""
+    scored_ids = []
+
+    async def fake_score(jobs, user_profile):
+        scored_ids.extend(job["job_id"] for job in jobs)
+        return [_score(job) for job in jobs]
+
+    monkeypatch.setattr(services, "_score_jobs_llm", fake_score)
+    posting = {"job_title": "Engineer", "company_name": "Acme", "description": "Rust"}
+    jobs = [{**posting, "job_id": "a"}, {**posting, "job_id": "b"}, {"job_id": "c", "job_title": "Other"}]
+
+    results = await services.match_jobs_batch_service(jobs, {})
+    assert scored_ids == ["a", "c"]
+    assert [r["job_id"] for r in results] == ["a", "b", "c"]
+    assert results[1]["match_score"] == 80
+
+    services._batch_score_cache.clear()
+    scored_ids.clear()
+    streamed = [r["job_id"] async for r in services.iter_jobs_batch_scores(jobs, {})]
+    assert scored_ids == ["a", "c"]
+    assert sorted(streamed) == ["a", "b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_stream_profile_enhancement_yields_sections_mid_stream(monkeypatch, enhancement_json):
+    """Each section should be yielded once the comma after it arrives, ignoring commas in strings."""
+    content = enhancement_json.replace("Names the stack", 'Names the stack, \\"LLMs\\" too')
+    sent = []
+
+    async def fake_stream(messages, **kwargs):
+        for i in range(0, len(content), 7):
+            sent.append(i)
+            yield content[i:i + 7]
+
+    monkeypatch.setattr(services, "_call_llm_stream", fake_stream)
+
+    seen = []
+    async for name, value in services.stream_profile_enhancement(
+        current_headline="Backend Engineer",
+        about_section="I build backends",
+        experience_descriptions=[],
+        current_skills=[],
+        target_role="AI Engineer",
+        years_of_experience=5,
+    ):
+        seen.append((name, len(sent)))
+
+    names = [name for name, _ in seen]
+    assert names == list(json.loads(content))
+    # The first section arrives long before the completion finishes
+    assert seen[0][1] < len(content) // 7 // 2
+
+
+@pytest.mark.asyncio
+async def test_score_jobs_llm_isolates_malformed_items(monkeypatch):
+    """A malformed item should fail only its own job; numeric strings are coerced."""
+    async def fake_call(messages, **kwargs):
+        base = {"ranking_level": "good", "missing_skills": [], "summary": "ok"}
+        return {"results": [
+            {"id": 0, **base, "match_percentage": "75", "matched_skills": None},
+            {"id": 1, **base, "match_percentage": "high", "matched_skills": []},
+            {"id": 2, **base, "match_percentage": 140, "matched_skills": "python"},
+            {"id": 3, **base, "match_percentage": "inf", "matched_skills": []},
+            {"id": [4], **base, "match_percentage": 50, "matched_skills": []},
+        ]}
+
+    monkeypatch.setattr(services, "_call_llm", fake_call)
+
+    jobs = [{"job_id": f"j{i}", "job_title": "Engineer"} for i in range(5)]
+    results = await services._score_jobs_llm(jobs, {"skills": ["python"]})
+
+    assert [r["job_id"] for r in results] == ["j0", "j1", "j2", "j3", "j4"]
+    assert results[0]["match_score"] == 75 and results[0]["matched_skills"] == []
+    assert "error" not in results[0]
+    assert all("error" in r for r in results[1:])
+
+
+@pytest.mark.asyncio
+async def test_batch_scoring_turns_group_errors_into_placeholders(monkeypatch):
+    """An exception from one group should not fail the batch or end the stream."""
+    async def fake_score(jobs, user_profile):
+        if jobs[0]["job_id"] == "j0":
+            raise RuntimeError("boom")
+        return [_score(job) for job in jobs]
+
+    monkeypatch.setattr(services, "_score_jobs_llm", fake_score)
+    monkeypatch.setattr(services, "BATCH_SCORE_JOBS_PER_CALL", 1)
+    jobs = [{"job_id": f"j{i}", "job_title": f"Engineer {i}"} for i in range(2)]
+
+    results = await services.match_jobs_batch_service(jobs, {"skills": ["python"]})
+    assert [("error" in r) for r in results] == [True, False]
+
+    streamed = [r async for r in services.iter_jobs_batch_scores(jobs, {"skills": ["go"]})]
+    assert sorted((r["job_id"], "error" in r) for r in streamed) == [("j0", True), ("j1", False)]